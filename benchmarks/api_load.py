@@ -0,0 +1,332 @@
+"""Нагрузочные сценарии публичного API на сгенерированных данных.
+
+Сценарии:
+    timeline       - листание ленты постов курсором, страница за страницей;
+    comments       - комментарии самого обсуждаемого поста по страницам;
+    follow-search  - поиск по подпискам по началу имени автора;
+    auth-storm     - массовое получение JWT-токенов.
+
+По умолчанию база создаётся во временном каталоге, наполняется
+posts.seeding и запросы идут через тестовый клиент Django без сети.
+С --database используется уже наполненная база. С --url запросы
+отправляются на запущенный локальный сервер, а --database указывает на
+его базу, из которой берутся пользователи и посты для сценариев; лимиты
+частоты запросов сервера нужно поднять, иначе auth-storm получит 429.
+
+Для каждого эндпоинта выводятся число запросов в секунду, p50 и p99.
+Результаты сохраняются в JSON (--save) и сравниваются с сохранёнными
+ранее (--baseline): рост p99 больше --tolerance - ненулевой код выхода.
+
+    python benchmarks/api_load.py --posts 100000 --save baseline.json
+    python benchmarks/api_load.py --posts 100000 --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+PROJECT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'yatube_api'
+)
+sys.path.insert(0, PROJECT_DIR)
+
+API = '/api/v1/'
+PAGE_SIZE = 20
+SCENARIO_PAGES = 10
+# Диагностика запросов искажает замеры, лимиты частоты запросов
+# отключаются отдельно.
+BENCHMARK_SETTINGS = {
+    'API_QUERY_INSPECTION': False,
+    'API_SERVER_TIMING': False,
+}
+
+
+def percentile(values, share):
+    """Значение с рангом share по методу ближайшего ранга."""
+    values = sorted(values)
+    index = max(int(round(share * len(values) + 0.5)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class Recorder:
+    """Задержки запросов по эндпоинтам."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+
+    def add(self, endpoint, latency):
+        self.latencies[endpoint].append(latency)
+
+
+class ClientSession:
+    """Запросы через тестовый клиент Django."""
+
+    def __init__(self, recorder, token=None):
+        from django.test import Client
+
+        self.client = Client()
+        self.recorder = recorder
+        self.headers = {}
+        if token:
+            self.headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+
+    def request(self, endpoint, method, path, data=None):
+        started = time.perf_counter()
+        if method == 'GET':
+            response = self.client.get(path, data, **self.headers)
+        else:
+            response = self.client.post(
+                path, data, content_type='application/json', **self.headers
+            )
+        self.recorder.add(endpoint, time.perf_counter() - started)
+        assert response.status_code < 400, (path, response.status_code)
+        return response.json()
+
+
+class HttpSession:
+    """Запросы к запущенному серверу по HTTP."""
+
+    def __init__(self, base_url, recorder, token=None):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.headers = {'Content-Type': 'application/json'}
+        if token:
+            self.headers['Authorization'] = f'Bearer {token}'
+
+    def request(self, endpoint, method, path, data=None):
+        body = None
+        if method == 'GET' and data:
+            path = f'{path}?{urlencode(data)}'
+        elif data is not None:
+            body = json.dumps(data).encode()
+        request = Request(
+            self.base_url + path, body, self.headers, method=method
+        )
+        started = time.perf_counter()
+        try:
+            with urlopen(request) as response:
+                content = response.read()
+        except HTTPError as error:
+            raise AssertionError((path, error.code)) from error
+        self.recorder.add(endpoint, time.perf_counter() - started)
+        return json.loads(content)
+
+
+def strip_origin(url):
+    """Путь со строкой запроса из абсолютной ссылки next."""
+    return url[url.index(API):]
+
+
+def scroll(session, endpoint, path, pages):
+    data = {'page_size': PAGE_SIZE}
+    for _ in range(pages):
+        page = session.request(endpoint, 'GET', path, data)
+        if not page['next']:
+            break
+        path, data = strip_origin(page['next']), None
+
+
+def timeline(session, context, rng):
+    scroll(session, 'posts-list', f'{API}posts/', SCENARIO_PAGES)
+    post_id = rng.choice(context['post_ids'])
+    session.request('posts-detail', 'GET', f'{API}posts/{post_id}/')
+
+
+def comments(session, context, rng):
+    post_id = context['hot_post_id']
+    scroll(
+        session, 'comments-list', f'{API}posts/{post_id}/comments/',
+        SCENARIO_PAGES
+    )
+
+
+def follow_search(session, context, rng):
+    prefix = context['prefix'] + str(rng.randint(1, 9))
+    session.request('follow-list', 'GET', f'{API}follow/', {
+        'search': prefix, 'page_size': PAGE_SIZE,
+    })
+
+
+def auth_storm(session, context, rng):
+    session.request('jwt-create', 'POST', f'{API}jwt/create/', {
+        'username': rng.choice(context['usernames']),
+        'password': context['password'],
+    })
+
+
+SCENARIOS = {
+    'timeline': (timeline, True),
+    'comments': (comments, True),
+    'follow-search': (follow_search, True),
+    'auth-storm': (auth_storm, False),
+}
+
+
+def setup_django(database):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
+    os.environ['YATUBE_DB_NAME'] = database
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    for name, value in BENCHMARK_SETTINGS.items():
+        setattr(settings, name, value)
+    settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {}
+
+
+def seed(args):
+    from django.core.management import call_command
+    from posts.seeding import Seeder
+
+    call_command('migrate', verbosity=0)
+    stats = Seeder(seed=args.seed, prefix=args.prefix).seed(
+        users=args.users, groups=args.groups, posts=args.posts,
+        comments=args.comments, follows_per_user=args.follows,
+        drop_indexes=True
+    )
+    for model, (rows, seconds) in stats.items():
+        print(f'{model:>10}: {rows:10d} rows {rows / seconds:10.0f} rows/s')
+
+
+def build_context(args):
+    from django.contrib.auth import get_user_model
+    from posts.models import Post
+    from posts.seeding import PASSWORD
+
+    users = get_user_model().objects.filter(
+        username__startswith=args.prefix
+    ).order_by('id')
+    post_ids = list(Post.objects.order_by('-id').values_list(
+        'id', flat=True
+    )[:1000])
+    return {
+        'prefix': args.prefix,
+        'password': PASSWORD,
+        'usernames': list(users.values_list('username', flat=True)[:1000]),
+        'post_ids': post_ids,
+        'hot_post_id': Post.objects.order_by(
+            '-comments_count'
+        ).values_list('id', flat=True).first(),
+    }
+
+
+def make_session(args, recorder, token=None):
+    if args.url:
+        return HttpSession(args.url, recorder, token)
+    return ClientSession(recorder, token)
+
+
+def run_scenario(args, context, scenario):
+    function, authenticated = SCENARIOS[scenario]
+    token = None
+    if authenticated:
+        token = make_session(args, Recorder()).request(
+            'jwt-create', 'POST', f'{API}jwt/create/', {
+                'username': context['usernames'][0],
+                'password': context['password'],
+            }
+        )['access']
+    recorder = Recorder()
+
+    def worker(index):
+        rng = random.Random(args.seed * 1000 + index)
+        session = make_session(args, recorder, token)
+        for _ in range(args.iterations):
+            function(session, context, rng)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(worker, range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        endpoint: {
+            'requests': len(latencies),
+            'rps': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.5) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+        }
+        for endpoint, latencies in sorted(recorder.latencies.items())
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Вывод изменений относительно базовой линии; True при регрессии."""
+    regressed = False
+    for scenario, endpoints in results.items():
+        for endpoint, result in endpoints.items():
+            base = baseline.get(scenario, {}).get(endpoint)
+            if base is None:
+                continue
+            change = result['p99_ms'] / base['p99_ms'] - 1
+            mark = ''
+            if change > tolerance:
+                mark = ' РЕГРЕССИЯ'
+                regressed = True
+            print(
+                f'{scenario:>14} {endpoint:<14} p99 {base["p99_ms"]:8.2f} -> '
+                f'{result["p99_ms"]:8.2f} ms ({change:+.0%}){mark}'
+            )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--scenario', action='append', choices=SCENARIOS,
+        help='Сценарий; по умолчанию все.'
+    )
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--url', help='Адрес запущенного сервера.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--prefix', default='user')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--groups', type=int, default=20)
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--comments', type=int, default=50000)
+    parser.add_argument('--follows', type=int, default=20)
+    parser.add_argument('--database', help='Файл готовой базы SQLite.')
+    parser.add_argument('--save', help='Файл для сохранения результатов.')
+    parser.add_argument('--baseline', help='Файл базовой линии.')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+    if args.url and not args.database:
+        parser.error('для --url нужна --database базы сервера')
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(
+            args.database or os.path.join(directory, 'bench.sqlite3')
+        )
+        if not args.database:
+            seed(args)
+        context = build_context(args)
+        results = {}
+        for scenario in args.scenario or SCENARIOS:
+            results[scenario] = run_scenario(args, context, scenario)
+            for endpoint, result in results[scenario].items():
+                print(
+                    f'{scenario:>14} {endpoint:<14} '
+                    f'{result["rps"]:8.1f} req/s '
+                    f'p50 {result["p50_ms"]:7.2f} ms '
+                    f'p99 {result["p99_ms"]:7.2f} ms'
+                )
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as file:
+            if compare(results, json.load(file), args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
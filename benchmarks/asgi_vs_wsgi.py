@@ -0,0 +1,116 @@
+"""Сравнение синхронного (WSGI) и асинхронного (ASGI) пути чтения.
+
+Один и тот же набор GET-запросов выполняется через синхронные вьюсеты
+DRF пулом потоков (как в WSGI-воркере с потоками) и через асинхронные
+обработчики /api/v1/async/ в одном цикле событий с тем же числом
+одновременных запросов.
+
+    python benchmarks/asgi_vs_wsgi.py --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'yatube_api'
+)
+sys.path.insert(0, PROJECT_DIR)
+
+PATHS = ('posts/?limit=20', 'posts/{post_id}/', 'groups/')
+
+
+def setup_django(directory, posts):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
+    os.environ['YATUBE_DB_NAME'] = os.path.join(directory, 'bench.sqlite3')
+    import django
+    django.setup()
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from posts.models import Group, Post
+
+    call_command('migrate', verbosity=0)
+    author = get_user_model().objects.create_user(username='bench')
+    group = Group.objects.create(title='Бенчмарк', slug='bench')
+    Post.objects.bulk_create(
+        Post(text=f'Пост {index}', author=author, group=group)
+        for index in range(posts)
+    )
+    return Post.objects.values_list('id', flat=True).first()
+
+
+def build_urls(prefix, post_id, count):
+    paths = [
+        f'/api/v1/{prefix}{path.format(post_id=post_id)}' for path in PATHS
+    ]
+    return [paths[index % len(paths)] for index in range(count)]
+
+
+def run_wsgi(urls, concurrency):
+    from django.test import Client
+
+    def fetch(url):
+        started = time.perf_counter()
+        response = Client().get(url)
+        assert response.status_code == 200, url
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(fetch, urls))
+    return latencies, time.perf_counter() - started
+
+
+async def run_asgi(urls, concurrency):
+    from django.test import AsyncClient
+
+    semaphore = asyncio.Semaphore(concurrency)
+    client = AsyncClient()
+
+    async def fetch(url):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(url)
+            assert response.status_code == 200, url
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(fetch(url) for url in urls))
+    return latencies, time.perf_counter() - started
+
+
+def report(name, latencies, elapsed):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f'{name:>5}: {len(latencies) / elapsed:8.1f} req/s '
+        f'p50 {p50:7.2f} ms p99 {p99:7.2f} ms'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--posts', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        post_id = setup_django(directory, args.posts)
+        report('wsgi', *run_wsgi(
+            build_urls('', post_id, args.requests), args.concurrency
+        ))
+        report('asgi', *asyncio.run(run_asgi(
+            build_urls('async/', post_id, args.requests), args.concurrency
+        )))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Пропускная способность чтения SQLite при одновременной записи.
+
+Сравнивает настройки SQLite по умолчанию с профилем production из
+settings.py: один поток постоянно пишет посты короткими транзакциями,
+несколько потоков читают страницу ленты.
+
+    python benchmarks/sqlite_concurrency.py --seconds 5 --readers 4
+"""
+import argparse
+import importlib
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'yatube_api'
+)
+sys.path.insert(0, PROJECT_DIR)
+
+from posts.db import apply_pragmas  # noqa: E402
+
+SCHEMA = '''
+CREATE TABLE post (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    pub_date TEXT NOT NULL
+);
+CREATE INDEX post_pub_date_id_idx ON post (pub_date DESC, id DESC);
+'''
+READ_QUERY = (
+    'SELECT id, text, pub_date FROM post '
+    'ORDER BY pub_date DESC, id DESC LIMIT 20'
+)
+
+
+def production_pragmas():
+    os.environ['YATUBE_DB_PROFILE'] = 'production'
+    settings = importlib.import_module('yatube_api.settings')
+    return settings.SQLITE_PRAGMAS
+
+
+def connect(path, pragmas):
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    apply_pragmas(connection.cursor(), pragmas)
+    return connection
+
+
+def run(path, pragmas, seconds, readers):
+    setup = connect(path, pragmas)
+    setup.executescript(SCHEMA)
+    setup.executemany(
+        'INSERT INTO post (text, pub_date) VALUES (?, datetime("now"))',
+        [('seed',)] * 10000
+    )
+    setup.commit()
+    setup.close()
+
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+
+    def writer():
+        connection = connect(path, pragmas)
+        while not stop.is_set():
+            connection.execute(
+                'INSERT INTO post (text, pub_date) '
+                'VALUES (?, datetime("now"))', ('post',)
+            )
+            connection.commit()
+            writes[0] += 1
+        connection.close()
+
+    def reader(index):
+        connection = connect(path, pragmas)
+        while not stop.is_set():
+            try:
+                connection.execute(READ_QUERY).fetchall()
+            except sqlite3.OperationalError:
+                continue
+            reads[index] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader, args=(index,))
+        for index in range(readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds, writes[0] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    args = parser.parse_args()
+
+    profiles = {
+        'default': {},
+        'production': production_pragmas(),
+    }
+    for name, pragmas in profiles.items():
+        with tempfile.TemporaryDirectory() as directory:
+            reads, writes = run(
+                os.path.join(directory, 'bench.sqlite3'),
+                pragmas, args.seconds, args.readers
+            )
+        print(f'{name:>10}: {reads:10.0f} reads/s {writes:8.0f} writes/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 import sys
 import os
 
+import pytest
+
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
@@ -27,6 +29,23 @@ if FILENAME not in project_dir_content:
         'Убедитесь, что у вас верная структура проекта.'
     )
 
+@pytest.fixture(autouse=True)
+def clear_caches(settings, tmp_path):
+    from django.core.cache import caches
+
+    # Файловый кеш JWT во временном каталоге теста, чтобы очистка не
+    # затронула записи запущенного сервера.
+    settings.CACHES = {
+        **settings.CACHES,
+        settings.JWT_USER_CACHE_ALIAS: {
+            **settings.CACHES[settings.JWT_USER_CACHE_ALIAS],
+            'LOCATION': str(tmp_path / 'jwt-users'),
+        },
+    }
+    for cache in caches.all():
+        cache.clear()
+
+
 pytest_plugins = [
     'tests.fixtures.fixture_user',
     'tests.fixtures.fixture_data',
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncReadAPI:
+
+    urls = (
+        '/api/v1/{prefix}posts/',
+        '/api/v1/{prefix}posts/?limit=1&offset=1',
+        '/api/v1/{prefix}posts/?page_size=1',
+        '/api/v1/{prefix}posts/{post_id}/',
+        '/api/v1/{prefix}posts/{post_id}/comments/',
+        '/api/v1/{prefix}posts/{post_id}/comments/{comment_id}/',
+        '/api/v1/{prefix}groups/',
+        '/api/v1/{prefix}groups/?page_size=1',
+        '/api/v1/{prefix}groups/{group_id}/',
+    )
+
+    def test_same_content(self, client, post, another_post, comment_1_post,
+                          group_1):
+        for url in self.urls:
+            ids = {
+                'post_id': post.id,
+                'comment_id': comment_1_post.id,
+                'group_id': group_1.id,
+            }
+            sync_url = url.format(prefix='', **ids)
+            async_url = url.format(prefix='async/', **ids)
+            response = client.get(async_url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{async_url}` возвращает ответ '
+                'со статусом 200.'
+            )
+            content = response.content.replace(b'/async/', b'/')
+            assert content == client.get(sync_url).content, (
+                f'Проверьте, что ответ `{async_url}` совпадает с ответом '
+                f'`{sync_url}`.'
+            )
+
+    def test_not_found_and_read_only(self, client, post):
+        response = client.get(f'/api/v1/async/posts/{post.id + 1}/comments/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.post('/api/v1/async/posts/', data={'text': 'a'})
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+    def test_cursor_pages(self, client, post, post_2, another_post):
+        url = '/api/v1/async/posts/?page_size=2'
+        ids = []
+        while url:
+            data = client.get(url).json()
+            assert len(data['results']) <= 2, (
+                'Проверьте, что асинхронный эндпоинт учитывает page_size.'
+            )
+            ids += [item['id'] for item in data['results']]
+            url = data['next']
+        assert ids == [another_post.id, post_2.id, post.id], (
+            'Проверьте, что курсорные страницы асинхронного эндпоинта '
+            'содержат все посты без повторов.'
+        )
+
+    def test_unsupported_params_rejected(self, client, post, group_1):
+        for url in (
+            '/api/v1/async/posts/?fields=id',
+            f'/api/v1/async/posts/?group={group_1.id}',
+            '/api/v1/async/posts/?search=пост',
+            f'/api/v1/async/posts/{post.id}/?fields=id',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{url}` отклоняется со статусом 400, а не '
+                'возвращает ответ без учёта параметра.'
+            )
+
+    def test_throttled(self, client, settings, post):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'anon': '1/min', 'user': None},
+        }
+        url = '/api/v1/async/posts/'
+        assert client.get(url).status_code == HTTPStatus.OK
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что асинхронные эндпоинты подчиняются лимитам '
+            'частоты запросов.'
+        )
+        assert 'Retry-After' in response
+
+    def test_invalid_token(self, client, post):
+        response = client.get(
+            '/api/v1/async/posts/', HTTP_AUTHORIZATION='Bearer invalid'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что асинхронные эндпоинты проверяют токен так же, '
+            'как синхронные.'
+        )
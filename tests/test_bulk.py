@@ -0,0 +1,152 @@
+from http import HTTPStatus
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+from rest_framework import viewsets
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.mixins import BulkCreateMixin
+from api.serializers import GroupSerializer
+from posts.models import Comment, FeedEntry, Follow, Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulk:
+
+    post_list_url = '/api/v1/posts/'
+    post_bulk_url = '/api/v1/posts/bulk/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+    comment_bulk_url = '/api/v1/posts/{post_id}/comments/bulk/'
+
+    def test_bulk_create_posts(self, user_client, user, another_user,
+                               group_1, group_2):
+        Follow.objects.create(user=another_user, following=user)
+        data = [
+            {'text': f'Пост {number}', 'group': group.id}
+            for number, group in enumerate((group_1, group_2) * 3)
+        ]
+        response = user_client.post(self.post_bulk_url, data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, response.content
+        created = response.json()
+        assert [item['text'] for item in created] == [
+            item['text'] for item in data
+        ], (
+            f'Проверьте, что POST-запрос к `{self.post_bulk_url}` создаёт '
+            'все посты и возвращает их в порядке запроса.'
+        )
+        assert all(item['id'] and item['pub_date'] for item in created)
+        assert all(item['author'] == user.username for item in created)
+        assert Post.objects.filter(author=user).count() == len(data)
+        assert FeedEntry.objects.filter(user=another_user).count() == len(
+            data
+        ), (
+            'Проверьте, что посты, созданные пачкой, попадают в ленты '
+            'подписчиков.'
+        )
+
+    def test_bulk_validation_queries(self, user_client, group_1, group_2):
+        def count_queries(size):
+            data = [
+                {'text': 'Пост', 'group': group.id}
+                for group in (group_1, group_2) * size
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = user_client.post(
+                    self.post_bulk_url, data, format='json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            return len(context)
+
+        assert count_queries(2) == count_queries(20), (
+            'Проверьте, что количество SQL-запросов при пакетном создании '
+            'не зависит от количества постов.'
+        )
+
+    def test_bulk_errors_per_item(self, user_client, group_1):
+        data = [
+            {'text': 'Верный пост', 'group': group_1.id},
+            {'group': group_1.id},
+            {'text': 'Пост', 'group': 100500},
+        ]
+        response = user_client.post(self.post_bulk_url, data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {} and 'text' in errors[1] and (
+            'group' in errors[2]
+        ), (
+            'Проверьте, что ошибки проверки возвращаются для каждого '
+            'элемента списка на его позиции.'
+        )
+        assert not Post.objects.exists(), (
+            'Проверьте, что при ошибке в одном элементе не создаётся '
+            'ни один пост.'
+        )
+
+    def test_bulk_limit(self, user_client, settings):
+        settings.API_BULK_MAX_ITEMS = 2
+        response = user_client.post(
+            self.post_bulk_url, [{'text': 'Пост'}] * 3, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_bulk_requires_auth(self, client):
+        response = client.post(
+            self.post_bulk_url, [{'text': 'Пост'}],
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_bulk_hook_required(self, user):
+        class GroupBulkViewSet(BulkCreateMixin, viewsets.GenericViewSet):
+            queryset = Group.objects.all()
+            serializer_class = GroupSerializer
+
+        request = APIRequestFactory().post(
+            '/bulk/', [{'title': 'Группа', 'slug': 'group'}], format='json'
+        )
+        force_authenticate(request, user)
+        view = GroupBulkViewSet.as_view({'post': 'bulk_create'})
+        with pytest.raises(ImproperlyConfigured):
+            view(request)
+        assert not Group.objects.exists()
+
+    def test_bulk_create_comments(self, user_client, user, post):
+        response = user_client.post(
+            self.comment_bulk_url.format(post_id=post.id),
+            [{'text': f'Комментарий {number}'} for number in range(3)],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.content
+        assert all(item['post'] == post.id for item in response.json())
+        assert Comment.objects.filter(post=post).count() == 3
+        response = user_client.get(self.post_detail_url.format(
+            post_id=post.id
+        ))
+        assert response.json()['comments_count'] == 3, (
+            'Проверьте, что пакетное создание комментариев обновляет '
+            '`comments_count` поста.'
+        )
+
+    def test_fetch_by_ids(self, user_client, post, post_2, another_post):
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(
+                self.post_list_url, {'ids': f'{post.id},{another_post.id}'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert sorted(item['id'] for item in response.json()) == sorted(
+            [post.id, another_post.id]
+        ), (
+            'Проверьте, что параметр `ids` возвращает посты с указанными id.'
+        )
+        assert sum(
+            'FROM "posts_post"' in query['sql']
+            for query in context.captured_queries
+        ) <= 2
+        for value in ('1,x', '99999999999999999999999', '1,²'):
+            response = user_client.get(self.post_list_url, {'ids': value})
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что некорректный `?ids={value}` отклоняется '
+                'со статусом 400.'
+            )
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+from django.db import transaction
+import pytest
+
+from api.caching import get_generation, get_stats
+from posts.models import Comment, Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCache:
+
+    post_list_url = '/api/v1/posts/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    group_url = '/api/v1/groups/'
+
+    def get(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_anonymous_hit_and_invalidation(self, client, user, post):
+        stats = get_stats()
+        assert self.get(client, self.post_list_url)['X-Cache'] == 'MISS'
+        response = self.get(client, self.post_list_url)
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный анонимный GET-запрос к '
+            f'`{self.post_list_url}` обслуживается из кеша.'
+        )
+        assert get_stats()['hits'] == stats['hits'] + 1
+
+        Post.objects.create(text='Новый пост', author=user)
+        response = self.get(client, self.post_list_url)
+        assert response['X-Cache'] == 'MISS'
+        assert len(response.json()) == 2, (
+            'Проверьте, что сохранение поста сбрасывает кеш списка постов.'
+        )
+
+    def test_invalidation_after_commit(self, client, user, post):
+        generation = get_generation('posts')
+        with transaction.atomic():
+            Post.objects.create(text='Новый пост', author=user)
+            assert get_generation('posts') == generation, (
+                'Проверьте, что кеш сбрасывается только после фиксации '
+                'транзакции.'
+            )
+        assert get_generation('posts') != generation, (
+            'Проверьте, что кеш сбрасывается после фиксации транзакции.'
+        )
+
+    def test_comment_invalidates_post(self, client, user, post):
+        detail_url = self.post_detail_url.format(post_id=post.id)
+        comments_url = self.comments_url.format(post_id=post.id)
+        self.get(client, detail_url)
+        self.get(client, comments_url)
+
+        Comment.objects.create(author=user, post=post, text='Коммент')
+        response = self.get(client, detail_url)
+        assert response.json()['comments_count'] == 1, (
+            'Проверьте, что новый комментарий сбрасывает кеш поста.'
+        )
+        assert len(self.get(client, comments_url).json()) == 1, (
+            'Проверьте, что новый комментарий сбрасывает кеш комментариев.'
+        )
+
+    def test_group_invalidation(self, client, group_1):
+        self.get(client, self.group_url)
+        Group.objects.create(title='Группа 3', slug='group_3')
+        assert len(self.get(client, self.group_url).json()) == 2, (
+            'Проверьте, что сохранение группы сбрасывает кеш групп.'
+        )
+
+    def test_authenticated_not_cached(self, user_client, post):
+        response = self.get(user_client, self.post_list_url)
+        assert 'X-Cache' not in response, (
+            'Проверьте, что запросы авторизованных пользователей не '
+            'кешируются.'
+        )
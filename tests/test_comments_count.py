@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+from django.core.management import call_command
+import pytest
+
+from api.serializers import PostSerializer
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCommentsCount:
+
+    post_detail_url = '/api/v1/posts/{post_id}/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    comment_detail_url = '/api/v1/posts/{post_id}/comments/{comment_id}/'
+
+    def get_count(self, client, post):
+        response = client.get(self.post_detail_url.format(post_id=post.id))
+        assert response.status_code == HTTPStatus.OK
+        assert 'comments_count' in response.json(), (
+            'Проверьте, что ответ на GET-запрос к '
+            f'`{self.post_detail_url}` содержит поле `comments_count`.'
+        )
+        return response.json()['comments_count']
+
+    def test_comments_count_create_delete(self, user_client, post):
+        assert self.get_count(user_client, post) == 0
+        response = user_client.post(
+            self.comments_url.format(post_id=post.id), data={'text': 'Текст'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.get_count(user_client, post) == 1, (
+            'Проверьте, что создание комментария увеличивает '
+            '`comments_count` поста.'
+        )
+        user_client.delete(self.comment_detail_url.format(
+            post_id=post.id, comment_id=response.json()['id']
+        ))
+        assert self.get_count(user_client, post) == 0, (
+            'Проверьте, что удаление комментария уменьшает '
+            '`comments_count` поста.'
+        )
+
+    def test_recount_comments_command(self, user, post, comment_1_post,
+                                      comment_2_post):
+        Post.objects.update(comments_count=10)
+        call_command('recount_comments')
+        post.refresh_from_db()
+        assert post.comments_count == Comment.objects.filter(
+            post=post
+        ).count(), (
+            'Проверьте, что команда `recount_comments` исправляет '
+            'счётчики комментариев.'
+        )
+
+    def test_update_keeps_concurrent_changes(self, user, post):
+        loaded = Post.objects.for_api().get(pk=post.pk)
+        Comment.objects.create(post=post, author=user, text='Комментарий')
+        renditions = {'small': {'width': 10, 'height': 10}}
+        Post.objects.filter(pk=post.pk).update(
+            image_width=10, image_height=10, image_renditions=renditions
+        )
+        serializer = PostSerializer(
+            loaded, data={'text': 'Новый текст'}, partial=True
+        )
+        assert serializer.is_valid(), serializer.errors
+        serializer.save()
+        post.refresh_from_db()
+        assert post.text == 'Новый текст'
+        assert post.comments_count == 1, (
+            'Проверьте, что изменение поста не перезаписывает '
+            '`comments_count`, увеличенный параллельным комментарием.'
+        )
+        assert (
+            post.image_width, post.image_height, post.image_renditions
+        ) == (10, 10, renditions), (
+            'Проверьте, что изменение поста не перезаписывает данные '
+            'обработки изображения.'
+        )
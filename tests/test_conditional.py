@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+from django.conf import settings as django_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+import pytest
+
+from api.checks import check_etag_cache
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConditionalGet:
+
+    post_list_url = '/api/v1/posts/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    group_url = '/api/v1/groups/'
+
+    @pytest.fixture(autouse=True)
+    def shared_cache(self, settings, tmp_path):
+        settings.CACHES = {
+            **django_settings.CACHES,
+            settings.API_CACHE_ALIAS: {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmp_path / 'api-cache'),
+            },
+        }
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert 'ETag' in response, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        etag = response['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        return etag
+
+    def test_not_modified(self, user_client, post, comment_1_post, group_1):
+        for url in (
+            self.post_list_url,
+            self.post_detail_url.format(post_id=post.id),
+            self.comments_url.format(post_id=post.id),
+            self.group_url,
+        ):
+            self.check_not_modified(user_client, url)
+
+    def test_no_stale_not_modified_on_edit(self, user_client, post):
+        url = self.post_detail_url.format(post_id=post.id)
+        response = user_client.get(url)
+        etag = response['ETag']
+        modified_since = response.get('Last-Modified', http_date())
+        user_client.patch(url, data={'text': 'Новый текст'})
+        response = user_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=modified_since
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после правки поста `If-Modified-Since` не '
+            'приводит к ответу 304.'
+        )
+        response = user_client.get(
+            url, HTTP_IF_NONE_MATCH=etag,
+            HTTP_IF_MODIFIED_SINCE=modified_since
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_no_stale_not_modified_on_delete(self, user_client, post,
+                                             post_2):
+        response = user_client.get(self.post_list_url)
+        etag = response['ETag']
+        modified_since = response.get('Last-Modified', http_date())
+        user_client.delete(self.post_detail_url.format(post_id=post.id))
+        for headers in (
+            {'HTTP_IF_MODIFIED_SINCE': modified_since},
+            {'HTTP_IF_NONE_MATCH': etag},
+        ):
+            response = user_client.get(self.post_list_url, **headers)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что после удаления поста список не отдаётся '
+                'как неизменившийся.'
+            )
+            assert [item['id'] for item in response.json()] == [post_2.id]
+
+    def test_no_aggregate_queries(self, user_client, post, post_2):
+        url = f'{self.post_list_url}?page_size=1'
+        etag = self.check_not_modified(user_client, url)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert not any(
+            'posts_post' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что ответ 304 не требует запросов к таблице постов.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            user_client.get(url)
+        assert not any(
+            'COUNT(' in query['sql'] or 'MAX(' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что валидаторы страницы курсора не считаются '
+            'агрегатами по всей таблице.'
+        )
+
+    def test_etag_changes_on_edit(self, user_client, post):
+        url = self.post_detail_url.format(post_id=post.id)
+        etag = self.check_not_modified(user_client, url)
+        user_client.patch(url, data={'text': 'Новый текст'})
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения поста `ETag` меняется.'
+        )
+        assert response.json()['text'] == 'Новый текст'
+
+    def test_no_etag_with_process_local_cache(self, settings, user_client,
+                                              post):
+        settings.CACHES = {
+            **settings.CACHES,
+            settings.API_CACHE_ALIAS: {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            },
+        }
+        response = user_client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK
+        assert 'ETag' not in response, (
+            'Проверьте, что ETag не отдаются, если поколения кеша хранятся '
+            'в памяти процесса.'
+        )
+        assert [
+            warning.id for warning in check_etag_cache(None)
+        ] == ['api.W001']
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestStreamingExport:
+
+    post_list_url = '/api/v1/posts/'
+    post_export_url = '/api/v1/posts/export/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    comments_export_url = '/api/v1/posts/{post_id}/comments/export/'
+
+    def stream(self, client, url, params=None):
+        response = client.get(url, params or {})
+        assert response.status_code == HTTPStatus.OK, response
+        assert response.streaming, (
+            f'Проверьте, что `{url}` отдаёт ответ потоком.'
+        )
+        return response, b''.join(response.streaming_content)
+
+    def test_json_matches_list(self, user_client, user, another_user,
+                               group_1, settings):
+        settings.API_EXPORT_CHUNK_SIZE = 2
+        for number in range(5):
+            Post.objects.create(
+                text=f'Пост {number}', author=user, group=group_1
+            )
+        Post.objects.create(text='Чужой пост', author=another_user)
+        response, content = self.stream(user_client, self.post_export_url)
+        assert response['Content-Type'] == 'application/json'
+        expected = user_client.get(self.post_list_url).json()
+        assert json.loads(content) == expected, (
+            'Проверьте, что выгрузка в JSON совпадает со списком постов.'
+        )
+        _, content = self.stream(
+            user_client, self.post_export_url, {'author': user.username}
+        )
+        assert len(json.loads(content)) == 5, (
+            'Проверьте, что выгрузку можно ограничить постами автора '
+            'параметром `author`.'
+        )
+
+    def test_ndjson(self, user_client, user, post, comment_1_post,
+                    comment_2_post):
+        response, content = self.stream(
+            user_client, self.comments_export_url.format(post_id=post.id),
+            {'output': 'ndjson'}
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = content.decode().splitlines()
+        expected = user_client.get(
+            self.comments_url.format(post_id=post.id)
+        ).json()
+        assert [json.loads(line) for line in lines] == expected, (
+            'Проверьте, что выгрузка в NDJSON содержит по одному '
+            'комментарию в строке.'
+        )
+        assert content.endswith(b'\n')
+
+    def test_empty(self, user_client):
+        _, content = self.stream(user_client, self.post_export_url)
+        assert content == b'[]'
+        _, content = self.stream(
+            user_client, self.post_export_url, {'output': 'ndjson'}
+        )
+        assert content == b''
+
+    def test_chunked_reads(self, user_client, user, settings):
+        settings.API_EXPORT_CHUNK_SIZE = 3
+        Post.objects.bulk_create(
+            Post(text='Пост', author=user) for _ in range(10)
+        )
+        response = user_client.get(self.post_export_url)
+        with CaptureQueriesContext(connection) as context:
+            chunks = list(response.streaming_content)
+        assert len(chunks) > 1, (
+            'Проверьте, что выгрузка отдаётся несколькими частями.'
+        )
+        assert len(context) == 1, (
+            'Проверьте, что выгрузка читает строки одним запросом через '
+            '`iterator()` без запросов на каждую строку.'
+        )
+
+    def test_comments_unknown_post(self, user_client):
+        response = user_client.get(
+            self.comments_export_url.format(post_id=100500)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_bad_output(self, user_client):
+        response = user_client.get(self.post_export_url, {'output': 'xml'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+from api.serializers import CommentSerializer, PostSerializer
+from posts.models import Comment, Post
+
+
+@pytest.fixture
+def contract_data(user, another_user, group_1, group_2):
+    renditions = {
+        'thumb': {
+            'width': 160, 'height': 90,
+            'webp': 'posts/ab/renditions/ab12_thumb.webp',
+            'jpeg': 'posts/ab/renditions/ab12_thumb.jpeg',
+        },
+    }
+    posts = [
+        Post.objects.create(
+            text='Пост с "кавычками", \\ и \u2028 разделителем строк',
+            author=user, group=group_1, image='posts/ab/ab12.jpg',
+            image_width=1600, image_height=900, image_renditions=renditions,
+        ),
+        Post.objects.create(text='Пост без группы ' * 40, author=another_user),
+        Post.objects.create(text='Ещё пост', author=user, group=group_2),
+    ]
+    for post in posts:
+        Comment.objects.create(post=post, author=another_user, text='Ответ 🙂')
+        Comment.objects.create(post=post, author=user, text='Спасибо')
+    return posts
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFastSerializationContract:
+
+    urls = [
+        ('/api/v1/posts/', {}),
+        ('/api/v1/posts/', {'limit': 2, 'offset': 1}),
+        ('/api/v1/posts/', {'page_size': 2}),
+        ('/api/v1/posts/', {'fields': 'id,author,renditions,pub_date'}),
+        ('/api/v1/posts/', {'exclude': 'text', 'compact': 'true'}),
+        ('/api/v1/posts/', {'compact': 'true', 'limit': 5}),
+        ('/api/v1/posts/', {'search': 'пост', 'group': 'group_2'}),
+        ('/api/v1/groups/', {}),
+        ('/api/v1/groups/', {'page_size': 1}),
+        ('/api/v1/groups/group_1/posts/', {'limit': 1}),
+        ('/api/v1/posts/{post_id}/comments/', {}),
+        ('/api/v1/posts/{post_id}/comments/', {'page_size': 1}),
+    ]
+
+    def get_content(self, client, settings, fast, url, params):
+        settings.API_FAST_SERIALIZATION = fast
+        response = client.get(url, params)
+        assert response.status_code == 200, response.content
+        return response.content
+
+    @pytest.mark.parametrize('url,params', urls)
+    def test_byte_identical(self, user_client, settings, contract_data,
+                            url, params):
+        url = url.format(post_id=contract_data[0].id)
+        expected = self.get_content(user_client, settings, False, url, params)
+        actual = self.get_content(user_client, settings, True, url, params)
+        assert actual == expected, (
+            f'Проверьте, что быстрая сериализация ответа на `{url}` '
+            f'с параметрами {params} совпадает с обычной байт в байт.'
+        )
+
+    def test_fast_path_used(self, user_client, settings, contract_data,
+                            monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError('Вызван to_representation сериализатора.')
+
+        monkeypatch.setattr(PostSerializer, 'to_representation', fail)
+        monkeypatch.setattr(CommentSerializer, 'to_representation', fail)
+        settings.API_FAST_SERIALIZATION = True
+        assert user_client.get('/api/v1/posts/').status_code == 200
+        assert user_client.get(
+            f'/api/v1/posts/{contract_data[0].id}/comments/'
+        ).status_code == 200
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFastRendererContract:
+
+    requests = [
+        ('get', '/api/v1/posts/', {}),
+        ('get', '/api/v1/posts/', {'page_size': 2}),
+        ('get', '/api/v1/posts/{post_id}/', {}),
+        ('get', '/api/v1/posts/0/', {}),
+        ('get', '/api/v1/posts/', {'ids': 'x'}),
+        ('post', '/api/v1/posts/', {}),
+        ('post', '/api/v1/posts/{post_id}/comments/', {'text': ''}),
+        ('get', '/api/v1/follow/', {}),
+    ]
+
+    def render(self, renderer, data, response=None):
+        return renderer.render(
+            data, 'application/json', {'response': response}
+        )
+
+    def test_disabled_by_default(self, settings):
+        assert settings.API_FAST_SERIALIZATION is False, (
+            'Проверьте, что быстрый рендерер включается только настройкой '
+            '`API_FAST_SERIALIZATION`.'
+        )
+
+    @pytest.mark.parametrize('method,url,data', requests)
+    def test_same_as_drf_renderer(self, user_client, client, settings,
+                                  contract_data, method, url, data):
+        settings.API_FAST_SERIALIZATION = True
+        url = url.format(post_id=contract_data[0].id)
+        for api_client in (user_client, client):
+            response = getattr(api_client, method)(url, data)
+            expected = self.render(JSONRenderer(), response.data, response)
+            assert response.content == expected, (
+                f'Проверьте, что ответ {method.upper()} `{url}` со статусом '
+                f'{response.status_code} совпадает с выводом JSONRenderer.'
+            )
+
+    def test_drf_types(self, settings):
+        settings.API_FAST_SERIALIZATION = True
+        data = {
+            'date': datetime(2024, 1, 2, 3, 4, 5, 678000, timezone.utc),
+            'decimal': Decimal('1.50'),
+            'items': ({'text': 'Ответ 🙂\u2029'}, None, 1.5, True),
+        }
+        assert self.render(FastJSONRenderer(), data) == self.render(
+            JSONRenderer(), data
+        )
@@ -0,0 +1,183 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from posts.feed import fan_out_post
+from posts.models import FeedEntry, Follow, PopularAuthor, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFeedAPI:
+
+    feed_url = '/api/v1/feed/'
+    follow_url = '/api/v1/follow/'
+    post_list_url = '/api/v1/posts/'
+
+    def feed_ids(self, client):
+        response = client.get(self.feed_url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос авторизованного пользователя к '
+            f'`{self.feed_url}` возвращает ответ со статусом 200.'
+        )
+        return [item['id'] for item in response.json()['results']]
+
+    def test_feed_not_auth(self, client):
+        response = client.get(self.feed_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.feed_url}` возвращает ответ со статусом 401.'
+        )
+
+    def test_feed_follow_backfill(self, user_client, user, another_user,
+                                  post, another_post):
+        assert self.feed_ids(user_client) == [], (
+            'Проверьте, что лента пользователя без подписок пуста.'
+        )
+        response = user_client.post(
+            self.follow_url, data={'following': another_user.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.feed_ids(user_client) == [another_post.id], (
+            'Проверьте, что после подписки в ленте появляются посты автора.'
+        )
+
+        follow_id = response.json()['id']
+        response = user_client.delete(f'{self.follow_url}{follow_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что DELETE-запрос к подписке пользователя удаляет её.'
+        )
+        assert self.feed_ids(user_client) == [], (
+            'Проверьте, что после отписки посты автора пропадают из ленты.'
+        )
+
+    def test_feed_fan_out_on_create(self, client, user_client, user,
+                                    another_user, follow_4):
+        response = user_client.post(
+            self.post_list_url, data={'text': 'Новый пост'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert FeedEntry.objects.filter(
+            user=another_user, post_id=response.json()['id']
+        ).exists(), (
+            'Проверьте, что новый пост добавляется в ленты подписчиков '
+            'автора.'
+        )
+
+    def test_feed_popular_author_pulled_on_read(self, settings, user_client,
+                                                user, user_2, another_user,
+                                                follow_1, follow_3):
+        settings.FEED_FANOUT_MAX_FOLLOWERS = 1
+        new_post = Post.objects.create(text='Пост', author=another_user)
+        fan_out_post(new_post)
+        assert not FeedEntry.objects.filter(post=new_post).exists(), (
+            'Проверьте, что посты популярных авторов не раскладываются по '
+            'лентам при записи.'
+        )
+        assert Follow.objects.filter(following=another_user).count() == 2
+        assert self.feed_ids(user_client) == [new_post.id], (
+            'Проверьте, что посты популярных авторов догружаются в ленту '
+            'при чтении.'
+        )
+        assert PopularAuthor.objects.filter(author=another_user).exists()
+
+    def test_feed_read_does_not_write(self, settings, user_client,
+                                      another_user, follow_1, follow_3):
+        settings.FEED_FANOUT_MAX_FOLLOWERS = 1
+        fan_out_post(Post.objects.create(text='Пост', author=another_user))
+        with CaptureQueriesContext(connection) as queries:
+            self.feed_ids(user_client)
+        writes = [
+            query['sql'] for query in queries
+            if query['sql'].lstrip().upper().startswith(
+                ('INSERT', 'UPDATE', 'DELETE')
+            ) and 'posts_' in query['sql']
+        ]
+        assert writes == [], (
+            f'Проверьте, что GET-запрос к `{self.feed_url}` не изменяет '
+            'данные.'
+        )
+
+    def test_feed_pages_merge_sources(self, settings, user_client, user,
+                                      user_2, another_user, follow_1,
+                                      follow_3):
+        settings.FEED_FANOUT_MAX_FOLLOWERS = 1
+        third_user = type(user).objects.create(username='ThirdUser')
+        Follow.objects.create(user=user, following=third_user)
+        posts = []
+        for index in range(5):
+            for author in (another_user, third_user):
+                post = Post.objects.create(text=f'Пост {index}', author=author)
+                fan_out_post(post)
+                posts.append(post)
+        assert FeedEntry.objects.filter(user=user).count() == 5
+        url, ids = f'{self.feed_url}?page_size=3', []
+        while url:
+            data = user_client.get(url).json()
+            assert len(data['results']) <= 3
+            ids += [item['id'] for item in data['results']]
+            url = data['next']
+        assert ids == [post.id for post in reversed(posts)], (
+            'Проверьте, что страницы ленты содержат посты обычных и '
+            'популярных авторов по дате публикации без пропусков и '
+            'повторов.'
+        )
+
+    def test_feed_default_page_size(self, user_client, another_user):
+        Post.objects.bulk_create(
+            Post(text=f'Пост {index}', author=another_user)
+            for index in range(25)
+        )
+        user_client.post(
+            self.follow_url, data={'following': another_user.username}
+        )
+        data = user_client.get(self.feed_url).json()
+        assert len(data['results']) == 20 and data['next'], (
+            f'Проверьте, что `{self.feed_url}` без параметров возвращает '
+            'страницу по умолчанию и ссылку на следующую.'
+        )
+
+    def test_feed_follow_backfills_all_posts(self, settings, user_client,
+                                             another_user):
+        settings.FEED_BATCH_SIZE = 7
+        Post.objects.bulk_create(
+            Post(text=f'Пост {index}', author=another_user)
+            for index in range(30)
+        )
+        response = user_client.post(
+            self.follow_url, data={'following': another_user.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert FeedEntry.objects.filter(
+            post__author=another_user
+        ).count() == 30, (
+            'Проверьте, что при подписке в ленту переносятся все посты '
+            'автора.'
+        )
+
+    def test_feed_prolific_author_read_on_request(self, settings,
+                                                  user_client, another_user):
+        settings.FEED_MAX_AUTHOR_POSTS = 10
+        Post.objects.bulk_create(
+            Post(text=f'Пост {index}', author=another_user)
+            for index in range(15)
+        )
+        response = user_client.post(
+            self.follow_url, data={'following': another_user.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert not FeedEntry.objects.exists(), (
+            'Проверьте, что посты автора с большим числом постов не '
+            'переносятся в ленту при подписке.'
+        )
+        assert PopularAuthor.objects.filter(author=another_user).exists()
+        response = user_client.get(self.feed_url, {'page_size': 100})
+        assert len(response.json()['results']) == 15, (
+            'Проверьте, что посты такого автора подмешиваются в ленту при '
+            'чтении.'
+        )
+
+    def test_feed_invalid_cursor(self, user_client):
+        response = user_client.get(f'{self.feed_url}?cursor=invalid')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+from django.db import connection
+import pytest
+
+from posts.models import Follow
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFollowPrefixSearch:
+
+    url = '/api/v1/follow/'
+
+    @pytest.fixture
+    def follows(self, user, django_user_model):
+        authors = django_user_model.objects.bulk_create(
+            django_user_model(username=username)
+            for username in ('Alice', 'alina', 'Bob', 'MalIce', 'Алиса')
+        )
+        Follow.objects.bulk_create(
+            Follow(user=user, following=author) for author in authors
+        )
+        return authors
+
+    def usernames(self, response):
+        assert response.status_code == HTTPStatus.OK, response.content
+        data = response.json()
+        if isinstance(data, dict):
+            data = data['results']
+        return sorted(item['following'] for item in data)
+
+    def test_prefix_case_insensitive(self, user_client, follows):
+        response = user_client.get(self.url, {'search': 'ALI'})
+        assert self.usernames(response) == ['Alice', 'alina'], (
+            'Проверьте, что поиск подписок ищет имя автора по началу '
+            'без учёта регистра.'
+        )
+        response = user_client.get(self.url, {'search': 'Ал'})
+        assert self.usernames(response) == ['Алиса']
+
+    def test_prefix_uses_index(self, django_user_model):
+        queryset = django_user_model.objects.filter(username__iprefix='ali')
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        assert 'auth_user_username_lower_idx' in plan, (
+            'Проверьте, что поиск по началу имени использует индекс '
+            f'по LOWER(username). План запроса: {plan}'
+        )
+
+    def test_follow_pagination(self, user_client, follows):
+        response = user_client.get(self.url, {'limit': 2})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == len(follows), (
+            'Проверьте, что список подписок поддерживает пагинацию '
+            '`limit`/`offset`.'
+        )
+        assert len(data['results']) == 2
+
+        seen = []
+        response = user_client.get(self.url, {'page_size': 2})
+        while True:
+            data = response.json()
+            seen.extend(item['following'] for item in data['results'])
+            if not data['next']:
+                break
+            response = user_client.get(data['next'])
+        assert sorted(seen) == sorted(
+            author.username for author in follows
+        ), (
+            'Проверьте, что курсорная пагинация подписок проходит весь '
+            'список без пропусков и повторов.'
+        )
@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from posts.models import Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGroupPosts:
+
+    post_list_url = '/api/v1/posts/'
+    group_list_url = '/api/v1/groups/'
+    group_posts_url = '/api/v1/groups/{slug}/posts/'
+
+    def ids(self, response):
+        assert response.status_code == HTTPStatus.OK, response.content
+        data = response.json()
+        if isinstance(data, dict):
+            data = data['results']
+        return [item['id'] for item in data]
+
+    def test_group_posts(self, user_client, post, post_2, another_post,
+                         group_1):
+        response = user_client.get(
+            self.group_posts_url.format(slug=group_1.slug)
+        )
+        assert self.ids(response) == [post_2.id, post.id], (
+            f'Проверьте, что `{self.group_posts_url}` возвращает только '
+            'посты группы, новые первыми.'
+        )
+        response = user_client.get(
+            self.group_posts_url.format(slug=group_1.slug), {'limit': 1}
+        )
+        assert response.json()['count'] == 2
+        assert self.ids(response) == [post_2.id]
+
+    def test_unknown_group(self, user_client):
+        response = user_client.get(self.group_posts_url.format(slug='nope'))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что для несуществующей группы возвращается 404.'
+        )
+
+    def test_group_filter(self, user_client, post, post_2, another_post,
+                          group_1, group_2):
+        for value in (group_2.id, group_2.slug):
+            response = user_client.get(self.post_list_url, {'group': value})
+            assert self.ids(response) == [another_post.id], (
+                'Проверьте, что параметр `group` фильтрует посты по id '
+                'или slug группы.'
+            )
+        response = user_client.get(self.post_list_url, {'group': 'nope'})
+        assert self.ids(response) == []
+        for value in ('99999999999999999999999', '²', '0'):
+            response = user_client.get(self.post_list_url, {'group': value})
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `?group={value}` не приводит к ошибке '
+                'сервера.'
+            )
+            assert self.ids(response) == []
+
+    def test_group_slug_cached(self, client, post, group_1):
+        url = self.group_posts_url.format(slug=group_1.slug)
+        client.get(url, {'limit': 1})
+        with CaptureQueriesContext(connection) as context:
+            client.get(url, {'limit': 2})
+        assert not any(
+            'posts_group' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что id группы по slug берётся из кеша.'
+        )
+        group_1.slug = 'renamed'
+        group_1.save()
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что кеш slug сбрасывается при изменении группы.'
+        )
+
+    def test_group_index_used(self, group_1):
+        queryset = Post.objects.filter(group_id=group_1.id)
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        assert 'post_group_pub_date_idx' in plan, plan
+        assert 'TEMP B-TREE' not in plan, (
+            'Проверьте, что посты группы сортируются по индексу без '
+            f'дополнительной сортировки. План запроса: {plan}'
+        )
+
+    def test_group_list_pagination(self, client):
+        Group.objects.bulk_create(
+            Group(title=f'Группа {number}', slug=f'group-{number}')
+            for number in range(5)
+        )
+        response = client.get(self.group_list_url, {'limit': 2})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 5, (
+            'Проверьте, что список групп поддерживает пагинацию.'
+        )
+        response = client.get(self.group_list_url, {'page_size': 3})
+        assert len(response.json()['results']) == 3
+        assert response.json()['next']
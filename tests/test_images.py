@@ -0,0 +1,285 @@
+from http import HTTPStatus
+import os
+from io import BytesIO, StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+import pytest
+from PIL import Image
+
+from posts import images
+from posts.models import Post
+
+
+def make_jpeg(width=1200, height=800):
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = 'Камера'
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'red').save(
+        buffer, 'JPEG', exif=exif
+    )
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_WORKERS = 0
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostImages:
+
+    post_list_url = '/api/v1/posts/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+
+    def create_post(self, user_client):
+        response = user_client.post(
+            self.post_list_url,
+            data={
+                'text': 'Пост с картинкой',
+                'image': SimpleUploadedFile(
+                    'photo.jpg', make_jpeg(), content_type='image/jpeg'
+                ),
+            },
+            format='multipart'
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.content
+        return response.json()['id']
+
+    def test_renditions(self, user_client, media_root, settings):
+        post_id = self.create_post(user_client)
+        response = user_client.get(self.post_detail_url.format(
+            post_id=post_id
+        ))
+        test_data = response.json()
+        assert (test_data['image_width'], test_data['image_height']) == (
+            800, 1200
+        ), (
+            'Проверьте, что размеры изображения сохраняются с учётом '
+            'ориентации из EXIF.'
+        )
+        renditions = test_data['renditions']
+        assert set(renditions) == set(settings.POST_IMAGE_RENDITIONS), (
+            'Проверьте, что ответ содержит все копии изображения в поле '
+            '`renditions`.'
+        )
+        for size_name, size in settings.POST_IMAGE_RENDITIONS.items():
+            rendition = renditions[size_name]
+            assert max(rendition['width'], rendition['height']) == size
+            assert rendition['webp'].endswith('.webp')
+            assert rendition['jpeg'].startswith('http://testserver/media/')
+
+    def test_exif_stripped(self, user_client, media_root):
+        post = Post.objects.get(pk=self.create_post(user_client))
+        with post.image.open('rb') as image_file:
+            image = Image.open(image_file)
+            assert not image.getexif(), (
+                'Проверьте, что EXIF удаляется из загруженного изображения.'
+            )
+
+    def upload(self, user_client, name, content):
+        response = user_client.post(
+            self.post_list_url,
+            data={'text': 'Пост', 'image': SimpleUploadedFile(name, content)},
+            format='multipart'
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.content
+        return Post.objects.get(pk=response.json()['id'])
+
+    def test_without_exif_kept_intact(self, user_client, media_root):
+        buffer = BytesIO()
+        Image.new('RGB', (300, 200), 'blue').save(buffer, 'JPEG')
+        post = self.upload(user_client, 'photo.jpg', buffer.getvalue())
+        with post.image.open('rb') as image_file:
+            assert image_file.read() == buffer.getvalue(), (
+                'Проверьте, что изображение без EXIF не кодируется заново.'
+            )
+
+    def test_animation_frames_kept(self, user_client, media_root):
+        buffer = BytesIO()
+        frames = [
+            Image.new('RGB', (40, 30), color)
+            for color in ('red', 'green', 'blue')
+        ]
+        frames[0].save(
+            buffer, 'GIF', save_all=True, append_images=frames[1:]
+        )
+        exif = Image.Exif()
+        exif[0x010F] = 'Камера'
+        animated = BytesIO()
+        Image.open(BytesIO(buffer.getvalue())).save(
+            animated, 'WEBP', save_all=True, exif=exif, lossless=True
+        )
+        for name, content in (
+            ('animation.gif', buffer.getvalue()),
+            ('animation.webp', animated.getvalue()),
+        ):
+            post = self.upload(user_client, name, content)
+            with post.image.open('rb') as image_file:
+                image = Image.open(image_file)
+                assert image.n_frames == 3, (
+                    'Проверьте, что у анимированного изображения '
+                    'сохраняются все кадры.'
+                )
+                assert not image.getexif()
+
+    def test_result_dropped_when_image_changed(self, user_client, user,
+                                               media_root, monkeypatch):
+        post = Post.objects.create(text='Пост', author=user)
+        post.image.save('photo.jpg', SimpleUploadedFile(
+            'photo.jpg', make_jpeg(300, 200)
+        ))
+        encode = images.encode
+
+        def concurrent_update(image, image_format):
+            Post.objects.filter(pk=post.pk).update(image='posts/other.jpg')
+            return encode(image, image_format)
+
+        monkeypatch.setattr(images, 'encode', concurrent_update)
+        images.process_post_image(post.pk)
+        post.refresh_from_db()
+        assert post.image.name == 'posts/other.jpg', (
+            'Проверьте, что обработка не перезаписывает изображение, '
+            'сменившееся за время обработки.'
+        )
+        assert post.image_renditions == {}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostImageUpload:
+
+    post_list_url = '/api/v1/posts/'
+
+    def upload(self, user_client, content, name='photo.png'):
+        return user_client.post(
+            self.post_list_url,
+            data={
+                'text': 'Пост',
+                'image': SimpleUploadedFile(name, content),
+            },
+            format='multipart'
+        )
+
+    def test_too_large(self, user_client, media_root, settings):
+        settings.POST_IMAGE_MAX_BYTES = 1024
+        response = self.upload(user_client, make_jpeg(600, 400))
+        assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE, (
+            'Проверьте, что слишком большой файл отклоняется со статусом 413.'
+        )
+        assert not Post.objects.exists()
+
+    def test_not_image(self, user_client, media_root):
+        response = self.upload(user_client, b'%PDF-1.4 ' * 100, 'doc.png')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что файл неподдерживаемого формата отклоняется.'
+        )
+
+    def test_too_many_pixels(self, user_client, media_root, settings):
+        settings.POST_IMAGE_MAX_DIMENSION = 100
+        buffer = BytesIO()
+        Image.new('L', (200, 10)).save(buffer, 'PNG')
+        response = self.upload(user_client, buffer.getvalue())
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что изображение со слишком большими размерами '
+            'отклоняется.'
+        )
+        assert 'image' in response.json()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestContentAddressedImages:
+
+    post_list_url = '/api/v1/posts/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+
+    def create_post(self, user_client, content):
+        response = user_client.post(
+            self.post_list_url,
+            data={
+                'text': 'Пост с картинкой',
+                'image': SimpleUploadedFile(
+                    'photo.jpg', content, content_type='image/jpeg'
+                ),
+            },
+            format='multipart'
+        )
+        assert response.status_code == HTTPStatus.CREATED, response.content
+        return Post.objects.get(pk=response.json()['id'])
+
+    def test_same_content_shares_file(self, user_client, media_root):
+        content = make_jpeg(300, 200)
+        first = self.create_post(user_client, content)
+        second = self.create_post(user_client, content)
+        assert first.image.name == second.image.name, (
+            'Проверьте, что одинаковые изображения хранятся одним файлом.'
+        )
+        call_command('collect_post_images', grace=0, stdout=StringIO())
+        files = [
+            path for path in (media_root / 'posts').rglob('*.jpg')
+            if 'renditions' not in path.parts
+        ]
+        assert len(files) == 1, (
+            'Проверьте, что исходный файл с EXIF удаляется после обработки '
+            'командой `collect_post_images`.'
+        )
+
+    def test_file_released_with_last_post(self, user_client, media_root):
+        content = make_jpeg(300, 200)
+        first = self.create_post(user_client, content)
+        second = self.create_post(user_client, content)
+        image_path = media_root / first.image.name
+        rendition_paths = [
+            media_root / name
+            for rendition in first.image_renditions.values()
+            for name in rendition.values() if isinstance(name, str)
+        ]
+        user_client.delete(self.post_detail_url.format(post_id=first.id))
+        call_command('collect_post_images', grace=0, stdout=StringIO())
+        assert image_path.exists(), (
+            'Проверьте, что файл не удаляется, пока на него ссылается '
+            'другой пост.'
+        )
+        user_client.delete(self.post_detail_url.format(post_id=second.id))
+        assert image_path.exists(), (
+            'Проверьте, что удаление поста не удаляет файл сразу.'
+        )
+        call_command('collect_post_images', grace=0, stdout=StringIO())
+        assert not image_path.exists(), (
+            'Проверьте, что файл без ссылок удаляется командой '
+            '`collect_post_images`.'
+        )
+        assert not any(path.exists() for path in rendition_paths)
+
+    def test_reupload_refreshes_grace_window(self, user_client, media_root):
+        content = make_jpeg(300, 200)
+        post = self.create_post(user_client, content)
+        image_path = media_root / post.image.name
+        user_client.delete(self.post_detail_url.format(post_id=post.id))
+        os.utime(image_path, (0, 0))
+        storage = Post.image.field.storage
+        assert storage.save(
+            'posts/photo.jpg', ContentFile(image_path.read_bytes())
+        ) == post.image.name
+        call_command('collect_post_images', stdout=StringIO())
+        assert image_path.exists(), (
+            'Проверьте, что повторное сохранение того же содержимого '
+            'защищает файл от удаления на время окна ожидания.'
+        )
+
+    def test_collect_post_images(self, user_client, media_root):
+        post = self.create_post(user_client, make_jpeg(300, 200))
+        orphan = media_root / 'posts' / 'ab' / 'orphan.jpg'
+        orphan.parent.mkdir(parents=True, exist_ok=True)
+        orphan.write_bytes(b'orphan')
+        call_command('collect_post_images', grace=0, stdout=StringIO())
+        assert not orphan.exists(), (
+            'Проверьте, что команда `collect_post_images` удаляет файлы '
+            'без ссылок.'
+        )
+        assert (media_root / post.image.name).exists()
+        for rendition in post.image_renditions.values():
+            assert (media_root / rendition['webp']).exists()
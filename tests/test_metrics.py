@@ -0,0 +1,116 @@
+from http import HTTPStatus
+import re
+
+import pytest
+
+from api.metrics import reset_metrics
+
+
+@pytest.mark.django_db(transaction=True)
+class TestMetrics:
+
+    post_list_url = '/api/v1/posts/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    metrics_url = '/metrics'
+
+    @pytest.fixture(autouse=True)
+    def clean_metrics(self):
+        reset_metrics()
+        yield
+        reset_metrics()
+
+    def get_metrics(self, client):
+        response = client.get(self.metrics_url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что `{self.metrics_url}` доступен с локального '
+            'адреса.'
+        )
+        return response.content.decode()
+
+    def get_value(self, metrics, name, view, method='GET'):
+        match = re.search(
+            rf'^{name}{{view="{view}",method="{method}"}} (\S+)$',
+            metrics, re.MULTILINE
+        )
+        assert match, (
+            f'Проверьте, что метрика `{name}` есть для маршрута `{view}`.'
+        )
+        return float(match.group(1))
+
+    def test_route_metrics(self, client, post, comment_1_post,
+                           comment_2_post):
+        response = client.get(self.post_list_url)
+        size = len(response.content)
+        client.get(self.post_list_url)
+        client.get(self.comments_url.format(post_id=post.id))
+        metrics = self.get_metrics(client)
+        assert self.get_value(
+            metrics, 'yatube_requests_total', 'posts-list'
+        ) == 2
+        assert self.get_value(
+            metrics, 'yatube_response_bytes_total', 'posts-list'
+        ) == 2 * size, (
+            'Проверьте, что метрики учитывают объём ответов.'
+        )
+        assert self.get_value(
+            metrics, 'yatube_db_queries_total', 'comments-list'
+        ) > 0, (
+            'Проверьте, что метрики учитывают SQL-запросы маршрута.'
+        )
+        assert self.get_value(
+            metrics, 'yatube_serializer_duration_seconds_total',
+            'comments-list'
+        ) > 0
+        assert self.get_value(
+            metrics, 'yatube_request_duration_seconds_count', 'posts-list'
+        ) == 2
+        assert 'yatube_request_duration_seconds_bucket{view="posts-list",' \
+            'method="GET",le="+Inf"} 2' in metrics
+        assert 'yatube_api_cache_hits_total' in metrics
+
+    def test_server_timing(self, client, post, settings):
+        settings.API_SERVER_TIMING = True
+        response = client.get(self.post_list_url)
+        header = response.get('Server-Timing', '')
+        assert re.fullmatch(
+            r'db;dur=[\d.]+;desc="\d+ SQL", serialize;dur=[\d.]+, '
+            r'total;dur=[\d.]+',
+            header
+        ), (
+            'Проверьте, что ответ содержит заголовок `Server-Timing` с '
+            'временем SQL-запросов, сериализации и всего запроса.'
+        )
+        settings.API_SERVER_TIMING = False
+        response = client.get(self.post_list_url)
+        assert 'Server-Timing' not in response
+
+    def test_proxied_access_forbidden(self, client):
+        response = client.get(
+            self.metrics_url, HTTP_X_FORWARDED_FOR='203.0.113.5'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.metrics_url}` недоступен через '
+            'обратный прокси без токена.'
+        )
+
+    def test_token_access(self, client, settings):
+        settings.METRICS_TOKEN = 'secret'
+        for headers in ({}, {'HTTP_AUTHORIZATION': 'Bearer wrong'}):
+            response = client.get(self.metrics_url, **headers)
+            assert response.status_code == HTTPStatus.FORBIDDEN, (
+                'Проверьте, что при заданном `METRICS_TOKEN` метрики '
+                'недоступны без верного токена даже с локального адреса.'
+            )
+        response = client.get(
+            self.metrics_url, REMOTE_ADDR='10.0.0.2',
+            HTTP_X_FORWARDED_FOR='203.0.113.5',
+            HTTP_AUTHORIZATION='Bearer secret'
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_remote_access_forbidden(self, client):
+        response = client.get(self.metrics_url, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.metrics_url}` недоступен с внешних '
+            'адресов.'
+        )
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCursorPagination:
+
+    post_list_url = '/api/v1/posts/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+
+    def walk_pages(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` с курсорной пагинацией '
+                'возвращает ответ со статусом 200.'
+            )
+            test_data = response.json()
+            for field in ('next', 'previous', 'results'):
+                assert field in test_data, (
+                    f'Проверьте, что ответ на GET-запрос к `{url}` с '
+                    f'курсорной пагинацией содержит поле `{field}`.'
+                )
+            ids.extend(item['id'] for item in test_data['results'])
+            url = test_data['next']
+        return ids
+
+    def test_posts_cursor_pages(self, client, user, post, post_2,
+                                another_post):
+        for index in range(4):
+            Post.objects.create(text=f'Пост {index}', author=user)
+
+        ids = self.walk_pages(client, f'{self.post_list_url}?page_size=3')
+        expected = list(
+            Post.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация постов возвращает все посты '
+            'по одному разу в порядке `(-pub_date, -id)`.'
+        )
+
+    def test_comments_cursor_pages(self, client, user, post, comment_1_post,
+                                   comment_2_post):
+        for index in range(3):
+            Comment.objects.create(author=user, post=post, text=str(index))
+
+        ids = self.walk_pages(
+            client, f'{self.comments_url.format(post_id=post.id)}?page_size=2'
+        )
+        expected = list(
+            post.comments.order_by('-created', '-id')
+            .values_list('id', flat=True)
+        )
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация комментариев возвращает все '
+            'комментарии поста по одному разу в порядке `(-created, -id)`.'
+        )
+
+    def test_limit_offset_still_supported(self, client, post, post_2,
+                                          another_post):
+        response = client.get(f'{self.post_list_url}?limit=1&offset=1')
+        test_data = response.json()
+        assert test_data['count'] == Post.objects.count(), (
+            'Проверьте, что пагинация `limit`/`offset` для '
+            f'`{self.post_list_url}` продолжает работать.'
+        )
+        response = client.get(self.post_list_url)
+        assert isinstance(response.json(), list), (
+            'Проверьте, что GET-запрос без параметров пагинации к '
+            f'`{self.post_list_url}` по-прежнему возвращает список.'
+        )
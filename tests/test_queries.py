@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from posts.models import Comment, Follow, Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueryCount:
+
+    post_list_url = '/api/v1/posts/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    follow_url = '/api/v1/follow/'
+    group_url = '/api/v1/groups/'
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return len(context)
+
+    def check_constant(self, client, url, add_rows):
+        queries_before = self.count_queries(client, url)
+        add_rows()
+        queries_after = self.count_queries(client, url)
+        assert queries_before == queries_after, (
+            f'Проверьте, что количество SQL-запросов при GET-запросе к '
+            f'`{url}` не зависит от количества объектов в ответе: '
+            f'{queries_before} запросов до добавления данных и '
+            f'{queries_after} после.'
+        )
+
+    def test_post_list_queries(self, client, user, another_user, post,
+                               group_1):
+        def add_rows():
+            for author in (user, another_user) * 3:
+                Post.objects.create(text='Пост', author=author, group=group_1)
+
+        self.check_constant(client, self.post_list_url, add_rows)
+        self.check_constant(
+            client, f'{self.post_list_url}?limit=5&offset=1', add_rows
+        )
+
+    def test_comment_list_queries(self, client, user, another_user, post,
+                                  comment_1_post):
+        def add_rows():
+            for author in (user, another_user) * 3:
+                Comment.objects.create(author=author, post=post, text='Текст')
+
+        self.check_constant(
+            client, self.comments_url.format(post_id=post.id), add_rows
+        )
+
+    def test_follow_list_queries(self, user_client, user, user_2,
+                                 django_user_model, follow_5):
+        def add_rows():
+            for index in range(5):
+                author = django_user_model.objects.create_user(
+                    username=f'author_{index}', password='1234567'
+                )
+                Follow.objects.create(user=user, following=author)
+
+        self.check_constant(user_client, self.follow_url, add_rows)
+
+    def test_group_list_queries(self, client, group_1):
+        def add_rows():
+            for index in range(5):
+                Group.objects.create(title=f'Группа {index}',
+                                     slug=f'group_n{index}')
+
+        self.check_constant(client, self.group_url, add_rows)
+
+    def test_comment_parent_fetched_once(self, user_client, post):
+        url = self.comments_url.format(post_id=post.id)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Текст'})
+        assert response.status_code == HTTPStatus.CREATED
+        post_queries = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "posts_post"' in query['sql']
+        ]
+        assert len(post_queries) == 1, (
+            f'Проверьте, что POST-запрос к `{url}` загружает пост '
+            'не более одного раза.'
+        )
+
+    def test_comment_parent_not_found(self, client, post):
+        url = self.comments_url.format(post_id=post.id + 100)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что GET-запрос к комментариям несуществующего поста '
+            'возвращает ответ со статусом 404.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.comments_url.format(post_id='abc'))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert len(context) == 0, (
+            'Проверьте, что некорректный `post_id` отклоняется без '
+            'обращения к базе данных.'
+        )
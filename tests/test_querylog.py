@@ -0,0 +1,89 @@
+from http import HTTPStatus
+import logging
+
+import pytest
+
+from api.querylog import DuplicateQueryError
+from api.views import PostViewSet
+from posts.models import Group
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueryInspection:
+
+    post_list_url = '/api/v1/posts/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    comment_detail_url = '/api/v1/posts/{post_id}/comments/{comment_id}/'
+
+    @pytest.fixture(autouse=True)
+    def strict(self, settings):
+        settings.API_QUERY_INSPECTION = True
+        settings.API_QUERY_INSPECTION_STRICT = True
+        settings.API_SLOW_QUERY_MS = 1000
+
+    @pytest.fixture
+    def duplicate_query(self, monkeypatch):
+        get_queryset = PostViewSet.get_queryset
+
+        def get_queryset_with_duplicate(view):
+            for _ in range(2):
+                list(Group.objects.filter(slug='dup'))
+            return get_queryset(view)
+
+        monkeypatch.setattr(
+            PostViewSet, 'get_queryset', get_queryset_with_duplicate
+        )
+
+    def test_duplicate_fails_in_strict_mode(self, client, post,
+                                            duplicate_query):
+        with pytest.raises(DuplicateQueryError) as error:
+            client.get(self.post_list_url)
+        assert 'api/mixins.py' in str(error.value), (
+            'Проверьте, что сообщение о повторном запросе содержит место '
+            'вызова.'
+        )
+
+    def test_duplicate_logged(self, client, post, duplicate_query, settings,
+                              caplog):
+        settings.API_QUERY_INSPECTION_STRICT = False
+        with caplog.at_level(logging.WARNING, logger='api.queries'):
+            response = client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK
+        assert 'Повторные SQL-запросы' in caplog.text, (
+            'Проверьте, что повторные запросы пишутся в журнал.'
+        )
+
+    def test_slow_query_logged(self, client, post, settings, caplog):
+        settings.API_SLOW_QUERY_MS = 0
+        with caplog.at_level(logging.WARNING, logger='api.queries'):
+            client.get(self.post_list_url)
+        assert 'Медленный запрос' in caplog.text
+        assert 'api/' in caplog.text, (
+            'Проверьте, что для медленного запроса указано место вызова '
+            'в коде проекта.'
+        )
+
+    def test_disabled(self, client, post, duplicate_query, settings):
+        settings.API_QUERY_INSPECTION = False
+        assert client.get(self.post_list_url).status_code == HTTPStatus.OK
+
+    def test_api_has_no_duplicates(self, client, user_client, post,
+                                   comment_1_post, comment_2_post,
+                                   group_1):
+        for url in (
+            self.post_list_url,
+            f'{self.post_list_url}{post.id}/',
+            self.comments_url.format(post_id=post.id),
+            self.comment_detail_url.format(
+                post_id=post.id, comment_id=comment_1_post.id
+            ),
+            '/api/v1/groups/',
+            f'/api/v1/groups/{group_1.slug}/posts/',
+            '/api/v1/follow/',
+            '/api/v1/feed/',
+        ):
+            user_client.get(url)
+        response = user_client.post(
+            self.comments_url.format(post_id=post.id), {'text': 'Текст'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
@@ -0,0 +1,131 @@
+from http import HTTPStatus
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+import pytest
+
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFullTextSearch:
+
+    post_list_url = '/api/v1/posts/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+
+    def search_ids(self, client, url, query, **params):
+        response = client.get(url, {'search': query, **params})
+        assert response.status_code == HTTPStatus.OK, response.content
+        data = response.json()
+        if isinstance(data, dict):
+            data = data['results']
+        return [item['id'] for item in data]
+
+    def test_post_search_ranked(self, user_client, user):
+        weak = Post.objects.create(
+            text='Утром прошёл дождь, потом гуляли в парке.', author=user
+        )
+        strong = Post.objects.create(
+            text='Парк, парк и ещё раз парк.', author=user
+        )
+        Post.objects.create(text='Совсем о другом', author=user)
+        assert self.search_ids(
+            user_client, self.post_list_url, 'ПАРК'
+        ) == [strong.id, weak.id], (
+            'Проверьте, что параметр `search` находит посты по словам '
+            'без учёта регистра и сортирует их по релевантности.'
+        )
+        assert self.search_ids(
+            user_client, self.post_list_url, 'парк дождь'
+        ) == [weak.id], (
+            'Проверьте, что в выдаче есть только посты со всеми словами '
+            'запроса.'
+        )
+
+    def test_post_search_paginated(self, user_client, user):
+        Post.objects.bulk_create(
+            Post(text=f'Заметка номер {number}', author=user)
+            for number in range(5)
+        )
+        response = user_client.get(
+            self.post_list_url, {'search': 'заметка', 'limit': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 5, (
+            'Проверьте, что поиск учитывает записи, созданные через '
+            '`bulk_create`, и работает с пагинацией.'
+        )
+        assert len(response.json()['results']) == 2
+
+    def test_cursor_pagination_rejected(self, user_client, user, post):
+        for url in (
+            self.post_list_url,
+            self.comments_url.format(post_id=post.id),
+            f'/api/v1/groups/{post.group.slug}/posts/',
+        ):
+            for params in ({'page_size': 2}, {'cursor': 'x'}):
+                response = user_client.get(url, {'search': 'пост', **params})
+                assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                    f'Проверьте, что поиск по `{url}` с параметрами '
+                    f'{params} отклоняется, а не теряет сортировку по '
+                    'релевантности.'
+                )
+            response = user_client.get(url, {'search': '', 'page_size': 2})
+            assert response.status_code == HTTPStatus.OK
+
+    def test_index_follows_changes(self, user_client, user):
+        post = Post.objects.create(text='Старый текст', author=user)
+        post.text = 'Новый текст'
+        post.save()
+        assert self.search_ids(user_client, self.post_list_url, 'старый') == []
+        assert self.search_ids(
+            user_client, self.post_list_url, 'новый'
+        ) == [post.id], (
+            'Проверьте, что индекс обновляется при изменении поста.'
+        )
+        post.delete()
+        assert self.search_ids(user_client, self.post_list_url, 'новый') == []
+
+    def test_query_syntax_is_escaped(self, user_client, user):
+        post = Post.objects.create(text='Кавычки и звёздочки', author=user)
+        assert self.search_ids(
+            user_client, self.post_list_url, '"кавычки" * ^('
+        ) == [post.id], (
+            'Проверьте, что спецсимволы запроса не ломают поиск.'
+        )
+
+    def test_comment_search(self, user_client, user, post, another_post):
+        comment = Comment.objects.create(
+            text='Отличная фотография', author=user, post=post
+        )
+        Comment.objects.create(
+            text='Отличная фотография', author=user, post=another_post
+        )
+        Comment.objects.create(text='Спасибо', author=user, post=post)
+        assert self.search_ids(
+            user_client, self.comments_url.format(post_id=post.id), 'фото'
+        ) == [comment.id], (
+            'Проверьте, что поиск по комментариям ограничен постом и '
+            'находит слова по началу.'
+        )
+
+    def test_rebuild_command(self, user_client, user):
+        post = Post.objects.create(text='Переиндексация', author=user)
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER posts_post_fts_insert')
+            cursor.execute(
+                "INSERT INTO posts_post_fts(posts_post_fts) "
+                "VALUES ('delete-all')"
+            )
+        call_command('rebuild_search_index', stdout=StringIO())
+        assert self.search_ids(
+            user_client, self.post_list_url, 'переиндексация'
+        ) == [post.id], (
+            'Проверьте, что команда `rebuild_search_index` восстанавливает '
+            'индекс.'
+        )
+        fresh = Post.objects.create(text='Переиндексация', author=user)
+        assert fresh.id in self.search_ids(
+            user_client, self.post_list_url, 'переиндексация'
+        )
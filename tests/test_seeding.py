@@ -0,0 +1,120 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, F
+import pytest
+
+from posts.models import (
+    Comment, FeedEntry, Follow, Group, PopularAuthor, Post
+)
+from posts.search import search
+from posts.seeding import Seeder, get_secondary_indexes
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSeeding:
+
+    counts = {
+        'users': 20, 'groups': 3, 'posts': 100, 'comments': 300,
+        'follows_per_user': 5,
+    }
+
+    def snapshot(self):
+        return (
+            list(Post.objects.order_by('id').values_list(
+                'text', 'author__username', 'group__slug'
+            )),
+            list(Comment.objects.order_by('id').values_list(
+                'text', 'post__text'
+            )),
+            list(Follow.objects.order_by('id').values_list(
+                'user__username', 'following__username'
+            )),
+        )
+
+    def test_seed(self, django_user_model):
+        stats = Seeder(seed=1, batch_size=40).seed(**self.counts)
+        assert django_user_model.objects.count() == 20
+        assert Group.objects.count() == 3
+        assert Post.objects.count() == 100
+        assert Comment.objects.count() == 300
+        assert Follow.objects.count() == 20 * 5
+        assert stats['post'][0] == 100, (
+            'Проверьте, что генератор сообщает число созданных строк.'
+        )
+        mismatched = Post.objects.annotate(
+            actual=Count('comments')
+        ).exclude(comments_count=F('actual'))
+        assert not mismatched.exists(), (
+            'Проверьте, что счётчики комментариев совпадают с таблицей.'
+        )
+        expected = Follow.objects.filter(
+            following__posts__isnull=False
+        ).values('user', 'following__posts').count()
+        assert FeedEntry.objects.count() == expected, (
+            'Проверьте, что генератор заполняет ленты подписчиков.'
+        )
+        assert stats['feedentry'][0] == expected
+        dates = list(Post.objects.order_by('id').values_list(
+            'pub_date', flat=True
+        ))
+        assert dates == sorted(dates) and dates[0] < dates[-1], (
+            'Проверьте, что посты получают разные даты публикации.'
+        )
+
+    def test_seed_popular_authors(self, settings):
+        settings.FEED_FANOUT_MAX_FOLLOWERS = 5
+        Seeder(seed=1).seed(**self.counts)
+        popular = set(Follow.objects.values('following').annotate(
+            total=Count('id')
+        ).filter(total__gt=5).values_list('following', flat=True))
+        assert popular and set(PopularAuthor.objects.values_list(
+            'author', flat=True
+        )) == popular, (
+            'Проверьте, что генератор отмечает авторов с большим числом '
+            'подписчиков как популярных.'
+        )
+        assert not FeedEntry.objects.filter(
+            post__author__in=popular
+        ).exists(), (
+            'Проверьте, что посты популярных авторов не переносятся в '
+            'ленты при наполнении.'
+        )
+
+    def test_deterministic(self):
+        Seeder(seed=7).seed(**self.counts)
+        first = self.snapshot()
+        for model in (Follow, Comment, Post, Group):
+            model.objects.all().delete()
+        Seeder(seed=7, prefix='again').seed(**self.counts)
+        second = self.snapshot()
+        assert [row[0] for row in first[0]] == [
+            row[0] for row in second[0]
+        ], (
+            'Проверьте, что при одном seed генерируются одинаковые данные.'
+        )
+        assert [row[0] for row in first[1]] == [row[0] for row in second[1]]
+
+    def test_seed_command(self, django_user_model):
+        tables = [model._meta.db_table for model in (Post, Comment, Follow)]
+        indexes = sorted(get_secondary_indexes(connection, tables))
+        out = StringIO()
+        call_command(
+            'seed', users=10, groups=2, posts=50, comments=100, follows=3,
+            batch_size=20, stdout=out
+        )
+        assert Post.objects.count() == 50
+        assert Comment.objects.count() == 100
+        assert 'строк/с' in out.getvalue(), (
+            'Проверьте, что команда `seed` сообщает скорость вставки.'
+        )
+        assert sorted(get_secondary_indexes(connection, tables)) == indexes, (
+            'Проверьте, что команда `seed` восстанавливает удалённые '
+            'индексы.'
+        )
+        word = Post.objects.values_list('text', flat=True)[0].split()[0]
+        assert search(Post.objects.all(), word).exists(), (
+            'Проверьте, что после команды `seed` работает полнотекстовый '
+            'поиск по созданным постам.'
+        )
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSparseFieldsets:
+
+    post_list_url = '/api/v1/posts/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+
+    def get(self, client, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, response.content
+        post_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "posts_post"' in query['sql']
+            and 'COUNT(' not in query['sql']
+            and 'MAX(' not in query['sql']
+        ]
+        return response.json(), post_queries
+
+    def test_fields(self, user_client, post, post_2):
+        data, queries = self.get(
+            user_client, self.post_list_url, {'fields': 'id,pub_date'}
+        )
+        assert all(set(item) == {'id', 'pub_date'} for item in data), (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'указанные поля.'
+        )
+        assert queries and not any(
+            '"posts_post"."text"' in sql or 'auth_user' in sql
+            for sql in queries
+        ), (
+            'Проверьте, что параметр `fields` сужает SQL-запрос до '
+            'нужных столбцов.'
+        )
+
+    def test_exclude(self, user_client, post):
+        data, queries = self.get(
+            user_client, self.post_detail_url.format(post_id=post.id),
+            {'exclude': 'text,renditions'}
+        )
+        assert 'text' not in data and 'renditions' not in data
+        assert data['author'] == post.author.username, (
+            'Проверьте, что параметр `exclude` убирает из ответа только '
+            'указанные поля.'
+        )
+        assert not any('"posts_post"."text"' in sql for sql in queries)
+
+    def test_unknown_field(self, user_client, post):
+        response = user_client.get(self.post_list_url, {'fields': 'id,nope'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестное поле в `fields` приводит к ошибке '
+            '400.'
+        )
+
+    def test_cursor_with_fields(self, user_client, user):
+        Post.objects.bulk_create(
+            Post(text='Пост', author=user) for _ in range(5)
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(
+                self.post_list_url, {'fields': 'id', 'page_size': 2}
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['next']
+        queries = [
+            query for query in context.captured_queries
+            if 'posts_post' in query['sql']
+        ]
+        assert len(queries) <= 2, (
+            'Проверьте, что столбцы сортировки загружаются вместе с '
+            'выборкой и курсор не требует дополнительных запросов.'
+        )
+
+    def test_compact(self, user_client, user, settings):
+        settings.API_COMPACT_TEXT_LENGTH = 10
+        Post.objects.create(text='Короткий', author=user)
+        Post.objects.create(text='Очень длинный текст поста', author=user)
+        data, queries = self.get(
+            user_client, self.post_list_url, {'compact': 'true'}
+        )
+        assert [item['text'] for item in data] == [
+            'Очень длин…', 'Короткий'
+        ], (
+            'Проверьте, что в режиме `compact` текст поста сокращается '
+            'на сервере.'
+        )
+        assert not any(
+            '"posts_post"."text"' in sql.replace('SUBSTR("posts_post"', '')
+            for sql in queries
+        ), (
+            'Проверьте, что в режиме `compact` полный текст не загружается '
+            'из базы данных.'
+        )
+        response = user_client.get(
+            self.post_detail_url.format(post_id=data[0]['id']),
+            {'compact': 'true'}
+        )
+        assert response.json()['text'] == 'Очень длинный текст поста'
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class TestStatelessJWT:
+
+    url_create = '/api/v1/jwt/create/'
+    follow_url = '/api/v1/follow/'
+
+    def get_client(self, user):
+        response = APIClient().post(
+            self.url_create,
+            data={'username': user.username, 'password': '1234567'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["access"]}'
+        )
+        return client
+
+    def test_no_user_query(self, user, follow_1):
+        client = self.get_client(user)
+        caches['default'].clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            '"auth_user"' in query['sql'].split('INNER JOIN')[0]
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что аутентификация по JWT не загружает пользователя '
+            'из базы данных.'
+        )
+
+    def test_inactive_user_rejected(self, user):
+        client = self.get_client(user)
+        user.is_active = False
+        user.save()
+        response = client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после деактивации пользователя его токен '
+            'перестаёт приниматься.'
+        )
+
+    def test_deleted_user_rejected(self, user):
+        client = self.get_client(user)
+        user.delete()
+        response = client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def clear_user_cache(self):
+        """Промах кеша, как в процессе, который не видел изменений."""
+        caches[settings.JWT_USER_CACHE_ALIAS].clear()
+
+    def test_inactive_user_rejected_on_cache_miss(self, user):
+        client = self.get_client(user)
+        user.is_active = False
+        user.save()
+        self.clear_user_cache()
+        response = client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что при промахе кеша активность пользователя '
+            'проверяется по базе данных, а не по claims токена.'
+        )
+
+    def test_deleted_user_rejected_on_cache_miss(self, user):
+        client = self.get_client(user)
+        user.delete()
+        self.clear_user_cache()
+        response = client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = client.post('/api/v1/posts/', {'text': 'Пост'})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя не принимается '
+            'при промахе кеша.'
+        )
+
+    def test_cache_miss_loads_user_once(self, user, follow_1):
+        client = self.get_client(user)
+        self.clear_user_cache()
+
+        def user_queries():
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(self.follow_url)
+            assert response.status_code == HTTPStatus.OK
+            return [
+                query for query in context.captured_queries
+                if '"auth_user"' in query['sql'].split('INNER JOIN')[0]
+            ]
+
+        assert len(user_queries()) == 1, (
+            'Проверьте, что при промахе кеша пользователь загружается из '
+            'базы данных одним запросом.'
+        )
+        assert not user_queries(), (
+            'Проверьте, что загруженная запись пользователя сохраняется в '
+            'кеше.'
+        )
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.throttling import parse_rate, take_token
+
+
+@pytest.mark.django_db(transaction=True)
+class TestThrottling:
+
+    post_list_url = '/api/v1/posts/'
+    jwt_create_url = '/api/v1/jwt/create/'
+
+    @pytest.fixture
+    def rates(self, settings):
+        def set_rates(**rates):
+            settings.REST_FRAMEWORK = {
+                **settings.REST_FRAMEWORK,
+                'DEFAULT_THROTTLE_RATES': {
+                    'anon': None, 'user': None, **rates
+                },
+            }
+        return set_rates
+
+    def test_parse_rate(self):
+        assert parse_rate('30/min') == (30, 0.5)
+        assert parse_rate('2/s') == (2, 2)
+        assert parse_rate(None) is None
+
+    def test_refill(self):
+        assert take_token('test', 2, 1, now=100) is None
+        assert take_token('test', 2, 1, now=100) is None
+        assert take_token('test', 2, 1, now=100) == pytest.approx(1), (
+            'Проверьте, что пустая корзина возвращает время ожидания '
+            'нового токена.'
+        )
+        assert take_token('test', 2, 1, now=100.5) == pytest.approx(0.5)
+        assert take_token('test', 2, 1, now=101) is None, (
+            'Проверьте, что корзина пополняется со временем.'
+        )
+        assert take_token('test', 2, 1, now=1000) is None
+        assert take_token('test', 2, 1, now=1000) is None
+        assert take_token('test', 2, 1, now=1000) is not None, (
+            'Проверьте, что число токенов не превышает ёмкость корзины.'
+        )
+
+    def test_anon_limit(self, client, rates):
+        rates(anon='2/min')
+        for _ in range(2):
+            assert client.get(self.post_list_url).status_code == HTTPStatus.OK
+        response = client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы сверх лимита получают ответ 429.'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что ответ 429 содержит заголовок `Retry-After`.'
+        )
+        response = client.get(
+            self.post_list_url, REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит анонимных запросов считается по IP-адресу.'
+        )
+
+    def test_user_limit(self, client, user_client, rates):
+        rates(anon='1/min', user='3/min')
+        for _ in range(3):
+            response = user_client.get(self.post_list_url)
+            assert response.status_code == HTTPStatus.OK
+        assert client.get(self.post_list_url).status_code == HTTPStatus.OK, (
+            'Проверьте, что запросы пользователя не расходуют лимит '
+            'анонимных запросов с того же адреса.'
+        )
+        response = user_client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+    def test_write_scope(self, user_client, rates):
+        rates(user='100/min', **{'posts-write': '1/min'})
+        data = {'text': 'Пост'}
+        response = user_client.post(self.post_list_url, data)
+        assert response.status_code == HTTPStatus.CREATED
+        response = user_client.post(self.post_list_url, data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что создание постов ограничено отдельным лимитом.'
+        )
+        response = user_client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит на создание постов не ограничивает чтение.'
+        )
+
+    def test_auth_scope(self, client, user, rates):
+        rates(anon='100/min', auth='1/min')
+        data = {'username': user.username, 'password': 'wrong'}
+        response = client.post(self.jwt_create_url, data)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = client.post(self.jwt_create_url, data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что получение токена ограничено лимитом `auth`.'
+        )
+        assert client.get(self.post_list_url).status_code == HTTPStatus.OK
@@ -0,0 +1,162 @@
+"""Асинхронные обработчики чтения постов, комментариев и групп.
+
+Под ASGI-сервером запрос не занимает поток на время ожидания базы
+данных: выборки идут через асинхронный ORM, а сериализация работает с
+уже загруженными объектами. Формат ответов совпадает с синхронными
+эндпоинтами. Аутентификация, права и лимиты частоты запросов
+проверяются так же, как в синхронных вьюсетах, а пагинация использует
+те же классы, включая курсоры. Параметры, которых обработчик не
+поддерживает (fields, search, group и другие), отклоняются с ошибкой
+400, а не игнорируются.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import APIView
+
+from posts.models import Comment, Group, Post
+from .pagination import CommentPagination, GroupPagination, PostPagination
+from .serializers import CommentSerializer, GroupSerializer, PostSerializer
+
+PAGINATION_PARAMS = ('limit', 'offset', 'cursor', 'page_size')
+
+
+class AccessCheckView(APIView):
+    """Проверки APIView.initial для асинхронного обработчика."""
+
+
+def check_access(request):
+    """DRF-запрос и ответ с ошибкой, если проверки не пройдены."""
+    view = AccessCheckView()
+    view.args, view.kwargs = (), {}
+    request = view.initialize_request(request)
+    view.request = request
+    view.headers = view.default_response_headers
+    try:
+        view.initial(request)
+    except Exception as exc:
+        response = view.finalize_response(
+            request, view.handle_exception(exc)
+        )
+        return request, response.render()
+    return request, None
+
+
+def read_only_api(*query_params):
+    """Только безопасные методы, известные параметры и проверки DRF."""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return HttpResponseNotAllowed(['GET', 'HEAD'])
+            unsupported = sorted(set(request.GET) - set(query_params))
+            if unsupported:
+                return render({'detail': (
+                    'Параметры не поддерживаются асинхронным эндпоинтом: '
+                    + ', '.join(unsupported)
+                )}, status=400)
+            request, denied = await sync_to_async(check_access)(request)
+            if denied is not None:
+                return denied
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render(data, status=200):
+    return HttpResponse(
+        JSONRenderer().render(data), content_type='application/json',
+        status=status
+    )
+
+
+async def serialize_page(request, queryset, serializer_class,
+                         pagination_class):
+    """Загрузка страницы выборки и её сериализация.
+
+    Курсорная страница строится синхронным пагинатором в потоке, страница
+    limit/offset и список без пагинации - асинхронным ORM.
+    """
+    paginator = pagination_class()
+    context = {'request': request}
+    if paginator.use_cursor(request):
+        objects = await sync_to_async(paginator.paginate_queryset)(
+            queryset, request
+        )
+        data = serializer_class(objects, many=True, context=context).data
+        return paginator.get_paginated_response(data).data
+    limit = paginator.get_limit(request)
+    if limit is None:
+        objects = [obj async for obj in queryset.aiterator()]
+        return serializer_class(objects, many=True, context=context).data
+    paginator.request = request
+    paginator.limit = limit
+    paginator.offset = paginator.get_offset(request)
+    paginator.count = await queryset.acount()
+    page = queryset[paginator.offset:paginator.offset + paginator.limit]
+    objects = [obj async for obj in page.aiterator()]
+    data = serializer_class(objects, many=True, context=context).data
+    return paginator.get_paginated_response(data).data
+
+
+async def serialize_object(request, queryset, serializer_class, **lookup):
+    try:
+        obj = await queryset.aget(**lookup)
+    except queryset.model.DoesNotExist:
+        raise Http404
+    return serializer_class(obj, context={'request': request}).data
+
+
+@read_only_api(*PAGINATION_PARAMS)
+async def post_list(request):
+    return render(await serialize_page(
+        request, Post.objects.for_api(), PostSerializer, PostPagination
+    ))
+
+
+@read_only_api()
+async def post_detail(request, pk):
+    return render(await serialize_object(
+        request, Post.objects.for_api(), PostSerializer, pk=pk
+    ))
+
+
+@read_only_api(*PAGINATION_PARAMS)
+async def comment_list(request, post_id):
+    queryset = Comment.objects.filter(post_id=post_id).select_related(
+        'author'
+    )
+    data = await serialize_page(
+        request, queryset, CommentSerializer, CommentPagination
+    )
+    results = data.get('results') if isinstance(data, dict) else data
+    if not results and not await Post.objects.filter(pk=post_id).aexists():
+        raise Http404
+    return render(data)
+
+
+@read_only_api()
+async def comment_detail(request, post_id, pk):
+    return render(await serialize_object(
+        request,
+        Comment.objects.filter(post_id=post_id).select_related('author'),
+        CommentSerializer,
+        pk=pk
+    ))
+
+
+@read_only_api(*PAGINATION_PARAMS)
+async def group_list(request):
+    return render(await serialize_page(
+        request, Group.objects.order_by('id'), GroupSerializer,
+        GroupPagination
+    ))
+
+
+@read_only_api()
+async def group_detail(request, pk):
+    return render(await serialize_object(
+        request, Group.objects.all(), GroupSerializer, pk=pk
+    ))
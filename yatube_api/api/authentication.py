@@ -0,0 +1,95 @@
+"""JWT-аутентификация без запроса пользователя на каждый запрос.
+
+Пользователь собирается из записи в общем для всех процессов кеше
+JWT_USER_CACHE_ALIAS, которую обновляют сигналы сохранения и удаления
+пользователя. При промахе кеша запись один раз читается из базы
+данных. Из токена берётся только идентификатор пользователя.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+RECORD_FIELDS = ('id', 'username', 'is_active')
+
+
+def get_cache():
+    return caches[settings.JWT_USER_CACHE_ALIAS]
+
+
+def get_cache_key(user_id):
+    return f'jwt-user:{user_id}'
+
+
+def make_record(user):
+    return {field: getattr(user, field) for field in RECORD_FIELDS}
+
+
+def remember_user(user):
+    """Запись актуальных данных пользователя для аутентификации."""
+    lifetime = settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+    get_cache().set(
+        get_cache_key(user.pk),
+        make_record(user),
+        timeout=int(lifetime.total_seconds())
+    )
+
+
+def forget_user(user):
+    """Запрет аутентификации удалённого пользователя по старым токенам."""
+    lifetime = settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+    get_cache().set(
+        get_cache_key(user.pk), {}, timeout=int(lifetime.total_seconds())
+    )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Аутентификация по токену с кешем записей пользователей."""
+
+    def get_record(self, user_id):
+        cache = get_cache()
+        record = cache.get(get_cache_key(user_id))
+        if record is not None:
+            return record
+        user = User.objects.only(*RECORD_FIELDS).filter(pk=user_id).first()
+        record = {} if user is None else make_record(user)
+        cache.set(
+            get_cache_key(user_id), record,
+            timeout=settings.JWT_USER_CACHE_TTL
+        )
+        return record
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        try:
+            user_id = User._meta.pk.to_python(
+                validated_token[api_settings.USER_ID_CLAIM]
+            )
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        record = self.get_record(user_id)
+        if not record:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        if api_settings.CHECK_USER_IS_ACTIVE and not record['is_active']:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return User.from_db(
+            DEFAULT_DB_ALIAS,
+            list(RECORD_FIELDS),
+            [record[field] for field in RECORD_FIELDS]
+        )
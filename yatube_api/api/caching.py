@@ -0,0 +1,132 @@
+"""Кеш ответов на анонимные GET-запросы к API.
+
+Ключ ответа включает путь, параметры запроса и поколения пространств
+имён, от которых зависит ответ. Сигналы моделей увеличивают поколение
+пространства, и все зависящие от него ответы перестают находиться в кеше.
+
+Поколение увеличивается только после фиксации транзакции: иначе запрос,
+пришедший между сбросом и фиксацией, прочитал бы старые строки и
+сохранил их под новым поколением.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from rest_framework.response import Response
+
+from posts.models import Group
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def record(event):
+    with _stats_lock:
+        _stats[event] += 1
+
+
+def get_stats():
+    """Количество попаданий и промахов кеша в текущем процессе."""
+    with _stats_lock:
+        return {'hits': _stats['hits'], 'misses': _stats['misses']}
+
+
+def get_generation(namespace):
+    cache = get_cache()
+    key = f'generation:{namespace}'
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate(*namespaces):
+    """Сброс ответов указанных пространств имён после фиксации транзакции."""
+    transaction.on_commit(lambda: bump_generations(namespaces))
+
+
+def bump_generations(namespaces):
+    cache = get_cache()
+    for namespace in namespaces:
+        key = f'generation:{namespace}'
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def get_group_id(slug):
+    """Идентификатор группы по slug или None; кеш живёт до правки групп."""
+    cache = get_cache()
+    key = f'group-id:{get_generation("groups")}:{slug}'
+    group_id = cache.get(key)
+    if group_id is None:
+        group_id = Group.objects.filter(slug=slug).values_list(
+            'pk', flat=True
+        ).first()
+        cache.set(key, group_id or 0, settings.GROUP_CACHE_TIMEOUT)
+    return group_id or None
+
+
+class CachedResponseMixin:
+    """Кеширование list и retrieve для анонимных безопасных запросов."""
+    cache_namespaces = ()
+    cache_timeout = DEFAULT_TIMEOUT
+
+    def get_cache_namespaces(self):
+        """Пространства имён, при изменении которых ответ устаревает."""
+        return self.cache_namespaces
+
+    def is_cacheable(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated
+        )
+
+    def get_response_cache_key(self, request):
+        generations = ':'.join(
+            f'{namespace}={get_generation(namespace)}'
+            for namespace in self.get_cache_namespaces()
+        )
+        query = request.GET.urlencode()
+        digest = hashlib.md5(
+            f'{request.get_host()}{request.path}?{query}|{generations}'
+            .encode()
+        ).hexdigest()
+        return f'response:{digest}'
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+        cache = get_cache()
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            record('hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        record('misses')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,19 @@
+from django.core.checks import Warning, register
+
+from .conditional import etags_enabled
+
+
+@register()
+def check_etag_cache(app_configs, **kwargs):
+    """Предупреждение об отключённых ETag при кеше в памяти процесса."""
+    if etags_enabled():
+        return []
+    return [Warning(
+        'Кеш ответов API хранится в памяти процесса, поэтому ETag и '
+        'ответы 304 отключены.',
+        hint=(
+            'Задайте API_CACHE_DIR или общий бэкенд кеша для '
+            'API_CACHE_ALIAS.'
+        ),
+        id='api.W001',
+    )]
@@ -0,0 +1,66 @@
+import hashlib
+
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.cache import get_conditional_response
+
+from .caching import get_cache, get_generation
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def etags_enabled():
+    """ETag отдаются, только если поколения общие для всех процессов."""
+    return not isinstance(get_cache(), PROCESS_LOCAL_BACKENDS)
+
+
+class ConditionalGetMixin:
+    """Условные GET-запросы по ETag для list и retrieve.
+
+    ETag считается без запросов к базе данных и без сериализации: из
+    адреса запроса и поколений пространств имён кеша, которые сигналы
+    моделей увеличивают при любом создании, правке и удалении.
+
+    Поколения в кеше памяти процесса не видят правок, обработанных
+    другими процессами, и ETag на них давал бы ответ 304 для изменённых
+    данных без ограничения по времени. Поэтому с таким кешем ETag не
+    отдаются совсем, а проверка api.W001 предупреждает об этом при
+    запуске; нужен общий кеш (API_CACHE_DIR, Redis, Memcached).
+
+    Last-Modified не отдаётся: даты публикации не меняются при правке и
+    удалении, и If-Modified-Since давал бы устаревший ответ 304.
+    """
+
+    def get_etag(self, request):
+        generations = [
+            f'{namespace}={get_generation(namespace)}'
+            for namespace in getattr(self, 'get_cache_namespaces', tuple)()
+        ]
+        source = '|'.join([
+            request.get_host(),
+            request.path,
+            request.GET.urlencode(),
+            *generations,
+        ])
+        return 'W/"%s"' % hashlib.md5(source.encode()).hexdigest()
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not etags_enabled():
+            return handler(request, *args, **kwargs)
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
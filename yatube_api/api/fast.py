@@ -0,0 +1,117 @@
+"""Быстрая сериализация списков из .values() в обход полей DRF.
+
+Строки ответа собираются из словарей .values() функциями доступа,
+подготовленными один раз на запрос: без экземпляров моделей и без
+вызова to_representation каждого поля. Формат ответа совпадает с
+обычными сериализаторами байт в байт, это проверяют контрактные тесты.
+"""
+from operator import itemgetter
+
+from rest_framework import serializers
+
+from posts.models import Post
+from .metrics import measure_serialization
+from .serializers import (
+    CommentSerializer,
+    GroupSerializer,
+    PostSerializer,
+    TruncatedTextField,
+    rendition_urls
+)
+
+
+class FastListSerializer:
+    """Сериализация строк .values() по описанию полей.
+
+    get_accessors возвращает для каждого поля ответа столбцы выборки и
+    функцию, которая строит значение поля по строке.
+    """
+    serializer_class = None
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        accessors = self.get_accessors()
+        names = self.context.get('fields')
+        if names is None:
+            names = self.serializer_class.Meta.fields
+        self.fields = [(name, accessors[name][1]) for name in names]
+        self.columns = {'id': None}
+        for name in names:
+            self.columns.update(dict.fromkeys(accessors[name][0]))
+
+    def get_accessors(self):
+        return {
+            name: ((name,), itemgetter(name))
+            for name in self.serializer_class.Meta.fields
+        }
+
+    def prepare(self, queryset):
+        """Выборка словарей со столбцами полей ответа и сортировки."""
+        columns = dict(self.columns)
+        for name in queryset.model._meta.ordering:
+            columns[name.lstrip('-')] = None
+        columns.update(dict.fromkeys(queryset.query.extra))
+        return queryset.values(*columns)
+
+    def serialize_row(self, row):
+        return {name: get(row) for name, get in self.fields}
+
+    def to_representation(self, rows):
+        fields = self.fields
+        with measure_serialization():
+            return [{name: get(row) for name, get in fields} for row in rows]
+
+
+def datetime_accessor(column):
+    to_representation = serializers.DateTimeField().to_representation
+    return (column,), lambda row: to_representation(row[column])
+
+
+class FastPostSerializer(FastListSerializer):
+    serializer_class = PostSerializer
+
+    def get_accessors(self):
+        accessors = super().get_accessors()
+        request = self.context.get('request')
+        storage = Post.image.field.storage
+
+        def image(row):
+            if not row['image']:
+                return None
+            url = storage.url(row['image'])
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            return url
+
+        def renditions(row):
+            return rendition_urls(row['image_renditions'], request)
+
+        accessors.update({
+            'pub_date': datetime_accessor('pub_date'),
+            'author': (('author__username',), itemgetter('author__username')),
+            'image': (('image',), image),
+            'renditions': (('image_renditions',), renditions),
+        })
+        compact_length = self.context.get('compact_text_length')
+        if compact_length:
+            truncate = TruncatedTextField(compact_length).to_representation
+            accessors['text'] = (
+                ('text_preview',), lambda row: truncate(row['text_preview'])
+            )
+        return accessors
+
+
+class FastCommentSerializer(FastListSerializer):
+    serializer_class = CommentSerializer
+
+    def get_accessors(self):
+        accessors = super().get_accessors()
+        accessors.update({
+            'author': (('author__username',), itemgetter('author__username')),
+            'created': datetime_accessor('created'),
+        })
+        return accessors
+
+
+class FastGroupSerializer(FastListSerializer):
+    serializer_class = GroupSerializer
@@ -0,0 +1,96 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+
+from posts.search import get_search_terms, has_search_index, search
+from .caching import get_group_id
+
+MAX_ID = 2 ** 63 - 1
+
+
+def parse_id(value):
+    """Целый id из строки ASCII-цифр в пределах BIGINT или None."""
+    if not (value.isascii() and value.isdigit()):
+        return None
+    value = int(value)
+    return value if 0 < value <= MAX_ID else None
+
+
+class FullTextSearchFilter(SearchFilter):
+    """Поиск по полнотекстовому индексу с сортировкой по релевантности.
+
+    Без индекса (не SQLite) используется обычный поиск по search_fields.
+    Курсорная пагинация сортирует по своему ключу и потеряла бы порядок
+    по релевантности, поэтому поиск с `cursor` или `page_size`
+    отклоняется: ранжированные результаты листаются через limit/offset.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not has_search_index(queryset):
+            return super().filter_queryset(request, queryset, view)
+        query = request.query_params.get(self.search_param, '')
+        paginator = getattr(view, 'paginator', None)
+        if (
+            get_search_terms(query)
+            and getattr(paginator, 'use_cursor', lambda request: False)(
+                request
+            )
+        ):
+            raise ValidationError({self.search_param: [
+                'Поиск сортирует по релевантности и не работает с '
+                'cursor и page_size; используйте limit и offset.'
+            ]})
+        return search(queryset, query)
+
+
+class PrefixSearchFilter(SearchFilter):
+    """Поиск с префиксом `^` в search_fields по индексу LOWER(поле)."""
+    lookup_prefixes = {**SearchFilter.lookup_prefixes, '^': 'iprefix'}
+
+
+class GroupFilter(BaseFilterBackend):
+    """Фильтр постов по группе: `?group=` с id или slug группы."""
+    group_param = 'group'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.group_param)
+        if not value:
+            return queryset
+        if value.isascii() and value.isdigit():
+            group_id = parse_id(value)
+        else:
+            group_id = get_group_id(value)
+        if group_id is None:
+            return queryset.none()
+        return queryset.filter(group_id=group_id)
+
+
+class IdsFilter(BaseFilterBackend):
+    """Выборка объектов по списку id: `?ids=1,2,3`."""
+    ids_param = 'ids'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.ids_param)
+        if value is None:
+            return queryset
+        ids = [parse_id(item) for item in value.split(',') if item]
+        if None in ids:
+            raise ValidationError(
+                {self.ids_param: ['Ожидаются id через запятую.']}
+            )
+        if len(ids) > settings.API_BULK_MAX_ITEMS:
+            raise ValidationError({self.ids_param: [
+                f'Не больше {settings.API_BULK_MAX_ITEMS} id за запрос.'
+            ]})
+        return queryset.filter(pk__in=set(ids))
+
+
+class AuthorFilter(BaseFilterBackend):
+    """Фильтр по автору: `?author=<username>`."""
+    author_param = 'author'
+
+    def filter_queryset(self, request, queryset, view):
+        username = request.query_params.get(self.author_param)
+        if not username:
+            return queryset
+        return queryset.filter(author__username=username)
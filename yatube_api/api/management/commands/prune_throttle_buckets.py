@@ -0,0 +1,24 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.models import ThrottleBucket
+
+
+class Command(BaseCommand):
+    help = 'Удаление корзин токенов, не использовавшихся дольше TTL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ttl', type=int, default=settings.API_THROTTLE_BUCKET_TTL,
+            help='Возраст последнего запроса в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        deleted, _ = ThrottleBucket.objects.using(
+            settings.API_THROTTLE_DATABASE
+        ).filter(updated__lt=time.time() - options['ttl']).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено корзин: {deleted}')
+        )
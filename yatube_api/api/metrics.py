@@ -0,0 +1,247 @@
+"""Метрики производительности запросов к API.
+
+Для каждого маршрута (posts-list, comments-detail, ...) и HTTP-метода
+накапливаются число запросов, распределение времени ответа, число и
+время SQL-запросов, время сериализации и объём ответов. Метрики
+отдаются в текстовом формате Prometheus, а показатели отдельного
+запроса - в заголовке Server-Timing.
+
+SQL-запросы учитываются обёрткой, которую получает каждое соединение с
+базой данных, поэтому учитываются и запросы асинхронных обработчиков,
+выполняемые в других потоках.
+"""
+import hmac
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .caching import get_stats
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+COUNTERS = (
+    ('requests_total', 'Число запросов.'),
+    ('db_queries_total', 'Число SQL-запросов.'),
+    ('db_duration_seconds_total', 'Время выполнения SQL-запросов.'),
+    ('serializer_duration_seconds_total', 'Время сериализации ответов.'),
+    ('response_bytes_total', 'Объём тел ответов в байтах.'),
+)
+PREFIX = 'yatube_'
+
+_current = ContextVar('request_metrics', default=None)
+_routes = defaultdict(Counter)
+_routes_lock = threading.Lock()
+
+
+class RequestMetrics:
+    """Показатели одного запроса."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def install_query_wrapper(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@contextmanager
+def measure_serialization():
+    """Учёт времени сериализации без SQL-запросов внутри блока.
+
+    Сериализатор списка сам выполняет выборку, если получил queryset,
+    поэтому время этих запросов вычитается.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    db_time = metrics.db_time
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.serializer_time += elapsed - (metrics.db_time - db_time)
+
+
+def get_route(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.url_name:
+        return 'unresolved'
+    return match.url_name
+
+
+def record_request(route, method, duration, metrics, size):
+    with _routes_lock:
+        counter = _routes[(route, method)]
+        counter['requests_total'] += 1
+        counter['request_duration_seconds_sum'] += duration
+        for bucket in DURATION_BUCKETS:
+            if duration <= bucket:
+                counter[bucket] += 1
+        counter['db_queries_total'] += metrics.queries
+        counter['db_duration_seconds_total'] += metrics.db_time
+        counter['serializer_duration_seconds_total'] += (
+            metrics.serializer_time
+        )
+        counter['response_bytes_total'] += size
+
+
+def reset_metrics():
+    with _routes_lock:
+        _routes.clear()
+
+
+def labels(route, method, **extra):
+    pairs = {'view': route, 'method': method, **extra}
+    return ','.join(f'{name}="{value}"' for name, value in pairs.items())
+
+
+def render_metrics():
+    """Накопленные метрики в текстовом формате Prometheus."""
+    with _routes_lock:
+        routes = {key: Counter(counter) for key, counter in _routes.items()}
+    lines = []
+    name = f'{PREFIX}request_duration_seconds'
+    lines.append(f'# HELP {name} Время ответа.')
+    lines.append(f'# TYPE {name} histogram')
+    for (route, method), counter in sorted(routes.items()):
+        for bucket in DURATION_BUCKETS:
+            lines.append(
+                f'{name}_bucket{{{labels(route, method, le=bucket)}}} '
+                f'{counter[bucket]}'
+            )
+        lines.append(
+            f'{name}_bucket{{{labels(route, method, le="+Inf")}}} '
+            f'{counter["requests_total"]}'
+        )
+        lines.append(
+            f'{name}_sum{{{labels(route, method)}}} '
+            f'{counter["request_duration_seconds_sum"]}'
+        )
+        lines.append(
+            f'{name}_count{{{labels(route, method)}}} '
+            f'{counter["requests_total"]}'
+        )
+    for metric, description in COUNTERS:
+        name = f'{PREFIX}{metric}'
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} counter')
+        for (route, method), counter in sorted(routes.items()):
+            lines.append(
+                f'{name}{{{labels(route, method)}}} {counter[metric]}'
+            )
+    for event, value in get_stats().items():
+        name = f'{PREFIX}api_cache_{event}_total'
+        lines.append(f'# HELP {name} Обращения к кешу ответов API.')
+        lines.append(f'# TYPE {name} counter')
+        lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def server_timing(duration, metrics):
+    return ', '.join((
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} SQL"',
+        f'serialize;dur={metrics.serializer_time * 1000:.1f}',
+        f'total;dur={duration * 1000:.1f}',
+    ))
+
+
+PROXY_HEADERS = ('HTTP_X_FORWARDED_FOR', 'HTTP_FORWARDED', 'HTTP_X_REAL_IP')
+
+
+def is_metrics_allowed(request):
+    """Доступ к метрикам по токену METRICS_TOKEN или с локального адреса.
+
+    За обратным прокси все запросы приходят с его адреса, поэтому без
+    токена запросы с заголовками прокси отклоняются даже с адресов
+    METRICS_ALLOWED_IPS.
+    """
+    if settings.METRICS_TOKEN:
+        return hmac.compare_digest(
+            request.META.get('HTTP_AUTHORIZATION', '').encode(),
+            f'Bearer {settings.METRICS_TOKEN}'.encode()
+        )
+    return (
+        request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+        and not any(header in request.META for header in PROXY_HEADERS)
+    )
+
+
+def metrics_view(request):
+    """Метрики для сборщика; доступ проверяет is_metrics_allowed."""
+    if not is_metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        render_metrics(), content_type='text/plain; version=0.0.4'
+    )
+
+
+class MetricsMiddleware:
+    """Сбор метрик запроса и заголовок Server-Timing.
+
+    SQL-запросы потоковых ответов выполняются уже после middleware и
+    в метрики не попадают, как и объём таких ответов.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, start, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, start, metrics)
+
+    def finish(self, request, response, start, metrics):
+        duration = time.perf_counter() - start
+        size = 0 if response.streaming else len(response.content)
+        record_request(
+            get_route(request), request.method, duration, metrics, size
+        )
+        if settings.API_SERVER_TIMING:
+            response['Server-Timing'] = server_timing(duration, metrics)
+        return response
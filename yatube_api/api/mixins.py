@@ -0,0 +1,260 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.functions import Substr
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from posts.db import read_only
+from .renderers import FastJSONRenderer
+
+
+class ReadReplicaMixin:
+    """Безопасные запросы читают данные через соединение для чтения."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with read_only():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ParentObjectMixin:
+    """Вложенный ресурс с родительским объектом из URL.
+
+    Родитель загружается не более одного раза за запрос. Список и
+    детальные действия фильтруют выборку по значению из URL и проверяют
+    существование родителя, только если выборка оказалась пустой.
+    """
+    parent_model = None
+    parent_field = None
+    parent_lookup_field = 'pk'
+    parent_url_kwarg = None
+
+    def get_parent_lookup(self):
+        return {self.parent_lookup_field: self.kwargs[self.parent_url_kwarg]}
+
+    def get_parent(self):
+        """Родительский объект из URL или 404, с кешем на время запроса."""
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model, **self.get_parent_lookup()
+            )
+        return self._parent
+
+    def check_parent_exists(self):
+        if hasattr(self, '_parent'):
+            return
+        if not self.parent_model.objects.filter(
+            **self.get_parent_lookup()
+        ).exists():
+            raise Http404
+
+    def filter_by_parent(self, queryset):
+        """Ограничение выборки объектами родителя без загрузки родителя."""
+        lookup = f'{self.parent_field}__{self.parent_lookup_field}'
+        return queryset.filter(**{lookup: self.kwargs[self.parent_url_kwarg]})
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        results = response.data
+        if isinstance(results, dict):
+            results = results.get('results')
+        if not results:
+            self.check_parent_exists()
+        return response
+
+
+class BulkCreateMixin:
+    """Создание списка объектов одним запросом и одной транзакцией.
+
+    Если хотя бы один элемент не прошёл проверку, ничего не создаётся,
+    а ответ содержит ошибки по позициям элементов. Объекты сохраняются
+    через bulk_create, поэтому сигналы моделей не отправляются и их
+    работу выполняет perform_bulk_create(validated_data), который
+    обязан определить вьюсет.
+    """
+    perform_bulk_create = None
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request, *args, **kwargs):
+        if self.perform_bulk_create is None:
+            raise ImproperlyConfigured(
+                f'{type(self).__name__} должен определить '
+                'perform_bulk_create(validated_data).'
+            )
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            max_length=settings.API_BULK_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            objects = self.perform_bulk_create(serializer.validated_data)
+        serializer = self.get_serializer(objects, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class SparseFieldsetViewMixin:
+    """Выбор полей ответа параметрами `fields`, `exclude` и `compact`.
+
+    Выборка сужается через only() до столбцов, нужных выбранным полям,
+    и столбцов сортировки. В режиме `compact` список отдаёт только начало
+    текста, вырезанное в SQL. field_sources сопоставляет полям
+    сериализатора поля модели, если их имена не совпадают.
+    """
+    fields_param = 'fields'
+    exclude_param = 'exclude'
+    compact_param = 'compact'
+    field_sources = {}
+
+    def parse_field_names(self, param):
+        names = [
+            name.strip()
+            for name in self.request.query_params.get(param, '').split(',')
+            if name.strip()
+        ]
+        unknown = set(names) - set(self.get_serializer_class().Meta.fields)
+        if unknown:
+            raise ValidationError({
+                param: [f'Неизвестные поля: {", ".join(sorted(unknown))}.']
+            })
+        return names
+
+    def get_requested_fields(self):
+        """Имена полей ответа или None, если нужны все поля."""
+        if self.request.method not in SAFE_METHODS:
+            return None
+        fields = self.parse_field_names(self.fields_param)
+        exclude = self.parse_field_names(self.exclude_param)
+        if not fields and not exclude:
+            return None
+        return [
+            name for name in self.get_serializer_class().Meta.fields
+            if (not fields or name in fields) and name not in exclude
+        ]
+
+    def get_compact_text_length(self):
+        value = self.request.query_params.get(self.compact_param, '')
+        if self.action != 'list' or value.lower() not in ('1', 'true'):
+            return None
+        return settings.API_COMPACT_TEXT_LENGTH
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if getattr(self, 'request', None) is not None:
+            context['fields'] = self.get_requested_fields()
+            context['compact_text_length'] = self.get_compact_text_length()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_requested_fields()
+        compact_length = self.get_compact_text_length()
+        if compact_length:
+            queryset = queryset.annotate(
+                text_preview=Substr('text', 1, compact_length + 1)
+            )
+        if fields is None and not compact_length:
+            return queryset
+        if fields is None:
+            fields = self.get_serializer_class().Meta.fields
+        ordering = queryset.model._meta.ordering
+        sources = {'pk', *(name.lstrip('-') for name in ordering)}
+        for name in fields:
+            if name == 'text' and compact_length:
+                continue
+            sources.update(self.field_sources.get(name, (name,)))
+        if not any('__' in source for source in sources):
+            queryset = queryset.select_related(None)
+        return queryset.only(*sources)
+
+
+class FastListMixin:
+    """Список через быстрый сериализатор строк .values().
+
+    Включается настройкой API_FAST_SERIALIZATION; ответ совпадает с
+    ответом обычного сериализатора.
+    """
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if (
+            not settings.API_FAST_SERIALIZATION
+            or self.fast_serializer_class is None
+        ):
+            return super().list(request, *args, **kwargs)
+        serializer = self.fast_serializer_class(self.get_serializer_context())
+        queryset = serializer.prepare(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(queryset))
+
+
+class StreamingExportMixin:
+    """Выгрузка всей выборки потоком JSON-массива или NDJSON.
+
+    Строки читаются из .values() через iterator() пачками по
+    API_EXPORT_CHUNK_SIZE и кодируются по мере отправки, поэтому память
+    не зависит от размера выборки. Строки совпадают с элементами списка
+    и собираются быстрым сериализатором fast_serializer_class.
+    """
+    export_param = 'output'
+    export_content_types = {
+        'json': 'application/json',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request, *args, **kwargs):
+        output = request.query_params.get(self.export_param, 'json')
+        if output not in self.export_content_types:
+            raise ValidationError({self.export_param: [
+                f'Допустимые значения: '
+                f'{", ".join(self.export_content_types)}.'
+            ]})
+        serializer = self.fast_serializer_class(self.get_serializer_context())
+        queryset = serializer.prepare(
+            self.filter_queryset(self.get_queryset())
+        )
+        # Поток читается после выхода из dispatch, поэтому база данных
+        # выбирается сейчас, пока действует маршрутизация запроса.
+        queryset = queryset.using(queryset.db)
+        response = StreamingHttpResponse(
+            self.stream_rows(serializer, queryset, output),
+            content_type=self.export_content_types[output],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{self.basename}.{output}"'
+        )
+        return response
+
+    def stream_rows(self, serializer, queryset, output):
+        encode = FastJSONRenderer().encode
+        chunk_size = settings.API_EXPORT_CHUNK_SIZE
+        lines = output == 'ndjson'
+        chunk = [] if lines else [b'[']
+        count = 0
+        for row in queryset.iterator(chunk_size=chunk_size):
+            data = encode(serializer.serialize_row(row))
+            if lines:
+                chunk.append(data + b'\n')
+            else:
+                chunk.append(b',' + data if count else data)
+            count += 1
+            if count % chunk_size == 0:
+                yield b''.join(chunk)
+                chunk = []
+        if not lines:
+            chunk.append(b']')
+        yield b''.join(chunk)
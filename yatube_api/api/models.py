@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class ThrottleBucket(models.Model):
+    """Корзина токенов для ограничения частоты запросов."""
+    key = models.CharField(
+        max_length=255, primary_key=True, verbose_name='Ключ'
+    )
+    tokens = models.FloatField(verbose_name='Токены')
+    updated = models.FloatField(verbose_name='Время обновления')
+
+    def __str__(self):
+        return self.key
+
+    class Meta:
+        verbose_name = 'Корзина токенов'
+        verbose_name_plural = 'Корзины токенов'
@@ -0,0 +1,130 @@
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(pagination.CursorPagination):
+    """Курсорная пагинация по составному ключу сортировки."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class PostCursorPagination(KeysetCursorPagination):
+    ordering = ('-pub_date', '-id')
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    ordering = ('-created', '-id')
+
+
+class FollowCursorPagination(KeysetCursorPagination):
+    ordering = ('-id',)
+
+
+class GroupCursorPagination(KeysetCursorPagination):
+    ordering = ('id',)
+
+
+class LimitOffsetOrCursorPagination(pagination.LimitOffsetPagination):
+    """Пагинация limit/offset с переходом на курсоры по запросу клиента.
+
+    Без параметров `cursor` и `page_size` поведение совпадает с
+    LimitOffsetPagination, поэтому старые клиенты продолжают работать.
+    """
+    cursor_pagination_class = None
+    cursor_paginator = None
+
+    def use_cursor(self, request):
+        cursor_class = self.cursor_pagination_class
+        return (
+            cursor_class is not None
+            and (cursor_class.cursor_query_param in request.query_params
+                 or cursor_class.page_size_query_param
+                 in request.query_params)
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class PostPagination(LimitOffsetOrCursorPagination):
+    cursor_pagination_class = PostCursorPagination
+
+
+class CommentPagination(LimitOffsetOrCursorPagination):
+    cursor_pagination_class = CommentCursorPagination
+    max_limit = 100
+
+
+class FeedPagination(KeysetCursorPagination):
+    """Курсорная пагинация ленты, включённая всегда.
+
+    Лента собирается из нескольких выборок и не является queryset, поэтому
+    страница запрашивается у posts.feed.Feed. Курсор хранит дату
+    публикации и id последнего поста страницы, переход назад не
+    поддерживается.
+    """
+    ordering = ('-pub_date', '-id')
+
+    def paginate_queryset(self, feed, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        page = feed.get_page(self.page_size + 1, self.decode_position())
+        self.has_next = len(page) > self.page_size
+        page = page[:self.page_size]
+        self.next_position = None
+        if self.has_next:
+            self.next_position = (page[-1].pub_date, page[-1].id)
+        return page
+
+    def decode_position(self):
+        encoded = self.request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            pub_date, post_id = b64decode(
+                encoded.encode(), altchars=b'-_', validate=True
+            ).decode().split('|')
+            return datetime.fromisoformat(pub_date), int(post_id)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        pub_date, post_id = self.next_position
+        encoded = b64encode(
+            f'{pub_date.isoformat()}|{post_id}'.encode(), altchars=b'-_'
+        ).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def get_previous_link(self):
+        return None
+
+
+class FollowPagination(LimitOffsetOrCursorPagination):
+    cursor_pagination_class = FollowCursorPagination
+    max_limit = 100
+
+
+class GroupPagination(LimitOffsetOrCursorPagination):
+    cursor_pagination_class = GroupCursorPagination
+    max_limit = 100
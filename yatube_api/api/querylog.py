@@ -0,0 +1,148 @@
+"""Журнал медленных SQL-запросов и поиск повторов внутри запроса к API.
+
+Режим для разработки и staging включается настройкой
+API_QUERY_INSPECTION. Запросы дольше API_SLOW_QUERY_MS пишутся в журнал
+api.queries вместе с местом вызова в коде проекта (представление,
+сериализатор), а одинаковые запросы с одинаковыми параметрами,
+выполненные в одном запросе к API несколько раз, - после ответа. При
+API_QUERY_INSPECTION_STRICT повтор вызывает DuplicateQueryError, так что
+тесты со строгим режимом падают на N+1.
+"""
+import logging
+import os
+import time
+import traceback
+from collections import Counter
+from contextvars import ContextVar
+
+import django.db
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger('api.queries')
+
+TRANSACTION_STATEMENTS = ('SAVEPOINT', 'RELEASE', 'ROLLBACK', 'BEGIN')
+MAX_CALL_SITE_FRAMES = 3
+
+_current = ContextVar('query_inspection', default=None)
+
+
+class DuplicateQueryError(AssertionError):
+    """Одинаковый SQL-запрос выполнен несколько раз за запрос к API."""
+
+
+def get_call_site():
+    """Ближайшие к запросу кадры стека из кода проекта до входа в ORM."""
+    project_dir = str(settings.BASE_DIR) + os.sep
+    orm_dir = os.path.dirname(django.db.__file__) + os.sep
+    stack = traceback.extract_stack()
+    for index, frame in enumerate(stack):
+        if frame.filename.startswith(orm_dir):
+            stack = stack[:index]
+            break
+    frames = [
+        frame for frame in stack
+        if frame.filename.startswith(project_dir)
+    ]
+    return ' <- '.join(
+        f'{os.path.relpath(frame.filename, project_dir)}:{frame.lineno} '
+        f'{frame.name}'
+        for frame in reversed(frames[-MAX_CALL_SITE_FRAMES:])
+    ) or 'вне кода проекта'
+
+
+class QueryInspection:
+    """SQL-запросы одного запроса к API."""
+
+    def __init__(self):
+        self.executed = Counter()
+        self.call_sites = {}
+
+    def record(self, sql, params, duration):
+        if duration * 1000 >= settings.API_SLOW_QUERY_MS:
+            logger.warning(
+                'Медленный запрос %.1f мс: %s; вызов: %s',
+                duration * 1000, sql, get_call_site()
+            )
+        if sql.lstrip().upper().startswith(TRANSACTION_STATEMENTS):
+            return
+        key = (sql, repr(params))
+        self.executed[key] += 1
+        if self.executed[key] == 2:
+            self.call_sites[key] = get_call_site()
+
+    def get_duplicates(self):
+        return {
+            key[0]: (count, self.call_sites[key])
+            for key, count in self.executed.items() if count > 1
+        }
+
+
+def inspect_query(execute, sql, params, many, context):
+    inspection = _current.get()
+    if inspection is None or many:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        inspection.record(sql, params, time.perf_counter() - start)
+
+
+@receiver(connection_created)
+def install_query_inspection(sender, connection, **kwargs):
+    if inspect_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(inspect_query)
+
+
+def report_duplicates(request, inspection):
+    duplicates = inspection.get_duplicates()
+    if not duplicates:
+        return
+    report = '\n'.join(
+        f'{count} раз: {sql}; повтор: {call_site}'
+        for sql, (count, call_site) in duplicates.items()
+    )
+    message = f'Повторные SQL-запросы в {request.method} {request.path}:\n'
+    if settings.API_QUERY_INSPECTION_STRICT:
+        raise DuplicateQueryError(message + report)
+    logger.warning('%s%s', message, report)
+
+
+class QueryInspectionMiddleware:
+    """Проверка SQL-запросов каждого запроса к API."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.API_QUERY_INSPECTION:
+            return self.get_response(request)
+        inspection = QueryInspection()
+        token = _current.set(inspection)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        report_duplicates(request, inspection)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.API_QUERY_INSPECTION:
+            return await self.get_response(request)
+        inspection = QueryInspection()
+        token = _current.set(inspection)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        report_duplicates(request, inspection)
+        return response
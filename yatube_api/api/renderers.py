@@ -0,0 +1,46 @@
+import json
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer с заранее созданным кодировщиком для простых данных.
+
+    Работает только при API_FAST_SERIALIZATION, иначе рендеринг целиком
+    выполняет JSONRenderer. Вывод совпадает с JSONRenderer байт в байт,
+    что проверяет тест контракта. Данные с типами, которые
+    умеет только кодировщик DRF, и форматирование с отступами
+    обрабатываются родительским классом.
+    """
+    _encoder = None
+
+    def get_encoder(self):
+        if self._encoder is None:
+            FastJSONRenderer._encoder = json.JSONEncoder(
+                ensure_ascii=self.ensure_ascii,
+                allow_nan=not self.strict,
+                check_circular=False,
+                separators=(',', ':') if self.compact else (', ', ': '),
+            )
+        return self._encoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            not settings.API_FAST_SERIALIZATION
+            or data is None
+            or self.get_indent(
+                accepted_media_type, renderer_context or {}
+            ) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return self.encode(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+    def encode(self, data):
+        """JSON без отступов; TypeError для типов, известных только DRF."""
+        ret = self.get_encoder().encode(data)
+        ret = ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+        return ret.encode()
@@ -1,34 +1,171 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
+from posts.images import RENDITION_FORMATS
 from posts.models import Post, Comment, Follow, Group
+from .metrics import measure_serialization
 
 User = get_user_model()
 
 
-class GroupSerializer(serializers.ModelSerializer):
+class TimedSerializerMixin:
+    """Учёт времени сериализации ответа в метриках запроса."""
+
+    @property
+    def data(self):
+        with measure_serialization():
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    pass
+
+
+class GroupSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели Group."""
     class Meta:
         model = Group
+        list_serializer_class = TimedListSerializer
         fields = ('id', 'title', 'slug', 'description')
         read_only_fields = ('id', 'slug')
 
 
-class PostSerializer(serializers.ModelSerializer):
+def rendition_urls(image_renditions, request=None):
+    storage = Post.image.field.storage
+    renditions = {}
+    for size_name, rendition in image_renditions.items():
+        renditions[size_name] = dict(rendition)
+        for extension in RENDITION_FORMATS:
+            url = storage.url(rendition[extension])
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            renditions[size_name][extension] = url
+    return renditions
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Связь по pk, которая берёт объекты из контекста, если они там есть.
+
+    Списочный сериализатор загружает объекты для всех элементов одним
+    запросом и кладёт в контекст словарь {pk: объект} под context_key.
+    """
+
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        objects = self.context.get(self.context_key)
+        if objects is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return objects[int(data)]
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+class PostListSerializer(TimedListSerializer):
+    """Проверка списка постов с одной выборкой групп на весь список."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            group_ids = {
+                str(item.get('group')) for item in data
+                if isinstance(item, dict)
+            }
+            self._context['groups'] = Group.objects.in_bulk(
+                [int(pk) for pk in group_ids if pk.isdigit()]
+            )
+        return super().to_internal_value(data)
+
+
+class TruncatedTextField(serializers.ReadOnlyField):
+    """Начало текста с многоточием, если текст длиннее length символов."""
+
+    def __init__(self, length, **kwargs):
+        self.length = length
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if len(value) <= self.length:
+            return value
+        return value[:self.length].rstrip() + '…'
+
+
+class SparseFieldsSerializerMixin:
+    """Выбор полей ответа по контексту сериализатора.
+
+    `fields` - имена выводимых полей, `compact_text_length` - длина
+    сокращённого текста, который берётся из аннотации text_preview.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        compact_length = self.context.get('compact_text_length')
+        if compact_length and 'text' in self.fields:
+            self.fields['text'] = TruncatedTextField(
+                compact_length, source='text_preview'
+            )
+
+
+class PostSerializer(
+    TimedSerializerMixin,
+    SparseFieldsSerializerMixin,
+    serializers.ModelSerializer
+):
     """Сериализатор для модели Post с обработкой изображений."""
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True,
     )
     image = serializers.ImageField(required=False, allow_null=True)
+    renditions = serializers.SerializerMethodField()
+    group = PrefetchedPrimaryKeyRelatedField(
+        'groups',
+        queryset=Group.objects.all(),
+        required=False,
+        allow_null=True,
+    )
 
     class Meta:
         model = Post
-        fields = ('id', 'text', 'pub_date', 'author', 'image', 'group')
-        read_only_fields = ('pub_date',)
+        list_serializer_class = PostListSerializer
+        fields = (
+            'id', 'text', 'pub_date', 'author', 'image', 'image_width',
+            'image_height', 'renditions', 'group', 'comments_count',
+        )
+        read_only_fields = (
+            'pub_date', 'image_width', 'image_height', 'comments_count'
+        )
+
+    def get_renditions(self, post):
+        """Уменьшенные копии изображения с абсолютными URL."""
+        return rendition_urls(
+            post.image_renditions, self.context.get('request')
+        )
+
+    def update(self, instance, validated_data):
+        """Запись только переданных полей.
+
+        Счётчик комментариев и данные обработки изображения меняются
+        другими запросами, пока пост загружен, и полная запись строки
+        вернула бы их устаревшие значения.
+        """
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели Comment с автоматическим определением автора."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -38,11 +175,12 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
+        list_serializer_class = TimedListSerializer
         fields = ('id', 'author', 'post', 'text', 'created')
         read_only_fields = ('created', 'post')
 
 
-class FollowSerializer(serializers.ModelSerializer):
+class FollowSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели Follow с валидацией подписок."""
     user = serializers.SlugRelatedField(
         slug_field='username',
@@ -56,6 +194,7 @@ class FollowSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Follow
+        list_serializer_class = TimedListSerializer
         fields = ('id', 'user', 'following')
         validators = [
             serializers.UniqueTogetherValidator(
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.models import Comment, Group, Post
+from .authentication import forget_user, remember_user
+from .caching import invalidate
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    """Сброс кеша списка постов, поста и его комментариев."""
+    invalidate('posts', f'post:{instance.pk}', f'comments:{instance.pk}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, origin=None, **kwargs):
+    """Сброс кеша комментариев поста и его счётчика комментариев."""
+    if isinstance(origin, Post) or getattr(origin, 'model', None) is Post:
+        return
+    invalidate(
+        f'comments:{instance.post_id}', 'posts', f'post:{instance.post_id}'
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):
+    """Сброс кеша групп и постов, ссылающихся на группы."""
+    invalidate('groups')
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """Обновление данных пользователя для JWT-аутентификации."""
+    remember_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    forget_user(instance)
@@ -0,0 +1,128 @@
+"""Ограничение частоты запросов корзинами токенов.
+
+Корзины хранятся в таблице базы данных API_THROTTLE_DATABASE, поэтому
+лимиты общие для всех процессов. Токен списывается одним условным
+запросом, который пополняет корзину за прошедшее время, так что
+параллельные запросы не могут списать один токен дважды.
+"""
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .models import ThrottleBucket
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+# Представления аутентификации из сторонних пакетов: им нельзя задать
+# throttle_scope, поэтому область определяется по модулю.
+AUTH_VIEW_MODULES = ('djoser.', 'rest_framework_simplejwt.')
+
+
+def parse_rate(rate):
+    """Ёмкость корзины и скорость пополнения в токенах в секунду."""
+    if rate is None:
+        return None
+    number, period = rate.split('/')
+    capacity = int(number)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def available_tokens(table, capacity, refill_rate):
+    """SQL-выражение числа токенов в корзине с учётом пополнения."""
+    refilled = (
+        f'{table}.tokens + (excluded.updated - {table}.updated) * '
+        f'{float(refill_rate)!r}'
+    )
+    capacity = float(capacity)
+    return (
+        f'(CASE WHEN {refilled} > {capacity!r} '
+        f'THEN {capacity!r} ELSE {refilled} END)'
+    )
+
+
+def take_token(key, capacity, refill_rate, now=None):
+    """Списание токена; None при успехе, иначе секунды до нового токена.
+
+    Новая корзина создаётся и существующая пополняется одним запросом
+    INSERT ... ON CONFLICT DO UPDATE, который меняет строку только при
+    наличии токена, поэтому на запрос приходится ровно один запрос к базе.
+    """
+    now = time.time() if now is None else now
+    table = ThrottleBucket._meta.db_table
+    available = available_tokens(table, capacity, refill_rate)
+    connection = connections[settings.API_THROTTLE_DATABASE]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (key, tokens, updated) VALUES (%s, %s, %s) '
+            f'ON CONFLICT (key) DO UPDATE SET tokens = {available} - 1, '
+            f'updated = excluded.updated WHERE {available} >= 1 '
+            f'RETURNING tokens',
+            [key, capacity - 1, now],
+        )
+        if cursor.fetchone() is not None:
+            return None
+    bucket = ThrottleBucket.objects.using(
+        settings.API_THROTTLE_DATABASE
+    ).get(key=key)
+    tokens = bucket.tokens + (now - bucket.updated) * refill_rate
+    tokens = min(capacity, tokens)
+    return max(1 - tokens, 0) / refill_rate
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Корзина токенов на пользователя или IP-адрес в области запроса.
+
+    Область берётся из throttle_scopes представления по действию, затем
+    из throttle_scope; иначе это auth для представлений аутентификации,
+    user для пользователей с токеном и anon для анонимных запросов.
+    Лимиты задаются в DEFAULT_THROTTLE_RATES.
+    """
+    wait_seconds = None
+
+    def get_scope(self, request, view):
+        scopes = getattr(view, 'throttle_scopes', {})
+        action = getattr(view, 'action', None)
+        if action in scopes:
+            return scopes[action]
+        if getattr(view, 'throttle_scope', None):
+            return view.throttle_scope
+        if type(view).__module__.startswith(AUTH_VIEW_MODULES):
+            return 'auth'
+        return 'user' if request.user.is_authenticated else 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return f'{self.get_scope(request, view)}:{ident}'
+
+    def allow_request(self, request, view):
+        rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(
+            self.get_scope(request, view)
+        ))
+        if rate is None:
+            return True
+        self.wait_seconds = take_token(
+            self.get_cache_key(request, view), *rate
+        )
+        return self.wait_seconds is None
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ThrottleRouter:
+    """Корзины токенов - в отдельной базе API_THROTTLE_DATABASE.
+
+    Остальные таблицы в эту базу не мигрируются.
+    """
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label == 'api' and model_name == 'throttlebucket':
+            return db == settings.API_THROTTLE_DATABASE
+        if db == settings.API_THROTTLE_DATABASE != DEFAULT_DB_ALIAS:
+            return False
+        return None
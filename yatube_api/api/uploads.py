@@ -0,0 +1,90 @@
+"""Потоковый приём изображений постов с ранними проверками.
+
+Файл пишется во временный файл по частям, поэтому память на загрузку
+ограничена размером части. Размер проверяется по мере поступления
+данных, формат - по сигнатуре первых байт, размеры в пикселях - по
+заголовку изображения до его декодирования.
+"""
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from PIL import Image
+from rest_framework import exceptions, status
+
+IMAGE_SIGNATURES = {
+    b'\xff\xd8\xff': 'JPEG',
+    b'\x89PNG\r\n\x1a\n': 'PNG',
+    b'GIF87a': 'GIF',
+    b'GIF89a': 'GIF',
+    b'RIFF': 'WEBP',
+}
+SIGNATURE_LENGTH = 12
+MAX_HEADER_BYTES = 256 * 1024
+
+
+class RequestEntityTooLarge(exceptions.APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Размер загружаемого файла превышает допустимый.'
+    default_code = 'request_entity_too_large'
+
+
+def invalid_image(message):
+    return exceptions.ValidationError({'image': [message]})
+
+
+def sniff_format(header):
+    for signature, image_format in IMAGE_SIGNATURES.items():
+        if header.startswith(signature):
+            if image_format == 'WEBP' and header[8:12] != b'WEBP':
+                return None
+            return image_format
+    return None
+
+
+class PostImageUploadHandler(TemporaryFileUploadHandler):
+    """Приём изображения поста во временный файл с ограничениями."""
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        if content_length > settings.POST_IMAGE_MAX_BYTES + 64 * 1024:
+            raise RequestEntityTooLarge()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.header = b''
+        self.header_checked = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.POST_IMAGE_MAX_BYTES:
+            raise RequestEntityTooLarge()
+        if not self.header_checked:
+            self.check_header(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def check_header(self, raw_data):
+        self.header += raw_data
+        if len(self.header) < SIGNATURE_LENGTH:
+            return
+        if sniff_format(self.header[:SIGNATURE_LENGTH]) is None:
+            raise invalid_image('Неподдерживаемый формат изображения.')
+        try:
+            width, height = Image.open(BytesIO(self.header)).size
+        except Image.DecompressionBombError:
+            width = height = settings.POST_IMAGE_MAX_DIMENSION + 1
+        except Exception:
+            if len(self.header) >= MAX_HEADER_BYTES:
+                raise invalid_image('Не удалось прочитать заголовок.')
+            return
+        limit = settings.POST_IMAGE_MAX_DIMENSION
+        if width > limit or height > limit:
+            raise invalid_image(
+                f'Размеры изображения не должны превышать {limit}px.'
+            )
+        self.header_checked = True
+        self.header = b''
+
+    def file_complete(self, file_size):
+        if not self.header_checked:
+            raise invalid_image('Не удалось прочитать заголовок.')
+        return super().file_complete(file_size)
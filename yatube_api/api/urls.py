@@ -6,22 +6,50 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView
 )
 
-from .views import PostViewSet, CommentViewSet, FollowViewSet, GroupViewSet
+from . import async_views
+from .views import (
+    CommentViewSet,
+    FeedViewSet,
+    FollowViewSet,
+    GroupPostViewSet,
+    GroupViewSet,
+    PostViewSet
+)
 
 router = DefaultRouter()
 router.register(r'posts', PostViewSet, basename='posts')
 router.register(
-    r'posts/(?P<post_id>[^/.]+)/comments',
+    r'posts/(?P<post_id>\d+)/comments',
     CommentViewSet,
     basename='comments'
 )
 router.register(r'follow', FollowViewSet, basename='follow')
 router.register(r'groups', GroupViewSet, basename='groups')
+router.register(
+    r'groups/(?P<group_slug>[-\w]+)/posts',
+    GroupPostViewSet,
+    basename='group-posts'
+)
+router.register(r'feed', FeedViewSet, basename='feed')
 
 API_VERSION = 'v1/'
 
+async_urlpatterns = [
+    path('posts/', async_views.post_list, name='async-posts-list'),
+    path('posts/<int:pk>/', async_views.post_detail,
+         name='async-posts-detail'),
+    path('posts/<int:post_id>/comments/', async_views.comment_list,
+         name='async-comments-list'),
+    path('posts/<int:post_id>/comments/<int:pk>/',
+         async_views.comment_detail, name='async-comments-detail'),
+    path('groups/', async_views.group_list, name='async-groups-list'),
+    path('groups/<int:pk>/', async_views.group_detail,
+         name='async-groups-detail'),
+]
+
 urlpatterns = [
     path(API_VERSION + '', include(router.urls)),
+    path(API_VERSION + 'async/', include(async_urlpatterns)),
     path(API_VERSION + 'auth/', include('djoser.urls')),
     path(API_VERSION + 'auth/', include('djoser.urls.jwt')),
 
@@ -1,68 +1,241 @@
 from rest_framework import (
-    pagination,
     viewsets,
-    permissions,
-    filters
+    permissions
 )
 from rest_framework.mixins import (
     CreateModelMixin,
+    DestroyModelMixin,
     ListModelMixin,
     RetrieveModelMixin
 )
-from django.shortcuts import get_object_or_404
+from rest_framework.decorators import action
+from django.conf import settings
+from django.db import transaction
 from django.contrib.auth import get_user_model
+from django.http import Http404
 
-from posts.models import Post, Group
+from posts.feed import (
+    add_author_to_feed,
+    fan_out_post,
+    fan_out_posts,
+    get_feed,
+    remove_author_from_feed
+)
+from posts.images import schedule_image_processing
+from posts.models import Comment, Group, Post
+from posts.signals import update_comments_count
+from .caching import CachedResponseMixin, get_group_id, invalidate
+from .conditional import ConditionalGetMixin
+from .fast import (
+    FastCommentSerializer,
+    FastGroupSerializer,
+    FastPostSerializer
+)
+from .filters import (
+    AuthorFilter,
+    FullTextSearchFilter,
+    GroupFilter,
+    IdsFilter,
+    PrefixSearchFilter
+)
+from .mixins import (
+    BulkCreateMixin,
+    FastListMixin,
+    ParentObjectMixin,
+    ReadReplicaMixin,
+    SparseFieldsetViewMixin,
+    StreamingExportMixin
+)
+from .pagination import (
+    CommentPagination,
+    FeedPagination,
+    FollowPagination,
+    GroupPagination,
+    PostPagination
+)
 from .serializers import (
     PostSerializer,
     CommentSerializer,
     FollowSerializer,
     GroupSerializer
 )
+from .uploads import PostImageUploadHandler
 
 User = get_user_model()
 
+POST_FIELD_SOURCES = {
+    'author': ('author__username',),
+    'renditions': ('image_renditions',),
+}
 
-class GroupViewSet(viewsets.ReadOnlyModelViewSet):
+
+class GroupViewSet(
+    ReadReplicaMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    FastListMixin,
+    viewsets.ReadOnlyModelViewSet
+):
     """Просмотр списка групп и детальной информации о группе."""
-    queryset = Group.objects.all()
+    queryset = Group.objects.order_by('id')
     serializer_class = GroupSerializer
+    fast_serializer_class = FastGroupSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = GroupPagination
+    cache_namespaces = ('groups',)
+    cache_timeout = settings.GROUP_CACHE_TIMEOUT
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class GroupPostViewSet(
+    ReadReplicaMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsetViewMixin,
+    FastListMixin,
+    ListModelMixin,
+    viewsets.GenericViewSet
+):
+    """Посты группы по её slug, новые первыми."""
+    serializer_class = PostSerializer
+    fast_serializer_class = FastPostSerializer
+    field_sources = POST_FIELD_SOURCES
+    pagination_class = PostPagination
+    filter_backends = [FullTextSearchFilter]
+    search_fields = ['text']
+    cache_namespaces = ('posts', 'groups')
+
+    def get_queryset(self):
+        """Выборка по индексу (group, pub_date) без соединения с группой."""
+        group_id = get_group_id(self.kwargs['group_slug'])
+        if group_id is None:
+            raise Http404
+        return Post.objects.for_api().filter(group_id=group_id)
+
+
+class PostViewSet(
+    ReadReplicaMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsetViewMixin,
+    BulkCreateMixin,
+    FastListMixin,
+    StreamingExportMixin,
+    viewsets.ModelViewSet
+):
     """Полный CRUD для постов с пагинацией."""
-    pagination_class = pagination.LimitOffsetPagination
+    pagination_class = PostPagination
     serializer_class = PostSerializer
-    queryset = Post.objects.all()
+    fast_serializer_class = FastPostSerializer
+    field_sources = POST_FIELD_SOURCES
+    queryset = Post.objects.for_api()
+    filter_backends = [
+        IdsFilter, AuthorFilter, GroupFilter, FullTextSearchFilter
+    ]
+    search_fields = ['text']
+    throttle_scopes = {'create': 'posts-write', 'bulk_create': 'posts-write'}
+
+    def initialize_request(self, request, *args, **kwargs):
+        """Потоковый приём изображений вместо буферизации в памяти."""
+        request.upload_handlers = [PostImageUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def get_cache_namespaces(self):
+        """Список зависит от всех постов, пост - только от себя."""
+        if self.action == 'retrieve':
+            return (f'post:{self.kwargs["pk"]}', 'groups')
+        return ('posts', 'groups')
 
     def perform_create(self, serializer):
-        """Автоматическое сохранение автора поста."""
-        serializer.save(author=self.request.user)
+        """Сохранение поста с автором и раскладка по лентам подписчиков."""
+        with transaction.atomic():
+            post = serializer.save(author=self.request.user)
+            fan_out_post(post)
+            schedule_image_processing(post)
+
+    def perform_bulk_create(self, validated_data):
+        """Вставка постов пачками, раскладка по лентам и сброс кеша."""
+        posts = Post.objects.bulk_create(
+            [
+                Post(author=self.request.user, **data)
+                for data in validated_data
+            ],
+            batch_size=settings.API_BULK_BATCH_SIZE,
+        )
+        fan_out_posts(self.request.user.pk, posts)
+        invalidate('posts')
+        return posts
+
+    def perform_update(self, serializer):
+        """Сохранение поста и обработка нового изображения."""
+        with transaction.atomic():
+            post = serializer.save()
+            if 'image' in serializer.validated_data:
+                schedule_image_processing(post)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ReadReplicaMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    ParentObjectMixin,
+    BulkCreateMixin,
+    FastListMixin,
+    StreamingExportMixin,
+    viewsets.ModelViewSet
+):
     """CRUD для комментариев к конкретному посту."""
     serializer_class = CommentSerializer
+    fast_serializer_class = FastCommentSerializer
+    pagination_class = CommentPagination
+    filter_backends = [FullTextSearchFilter]
+    search_fields = ['text']
+    throttle_scopes = {
+        'create': 'comments-write', 'bulk_create': 'comments-write'
+    }
+    parent_model = Post
+    parent_field = 'post'
+    parent_url_kwarg = 'post_id'
 
-    def get_post(self):
-        """Получение поста по ID из URL или возврат 404."""
-        post_id = self.kwargs['post_id']
-        return get_object_or_404(Post, pk=post_id)
+    def get_cache_namespaces(self):
+        return (f'comments:{self.kwargs["post_id"]}',)
 
     def get_queryset(self):
         """Получение комментариев только для указанного поста."""
-        post = self.get_post()
-        return post.comments.select_related('author')
+        return self.filter_by_parent(
+            Comment.objects.select_related('author')
+        )
 
     def perform_create(self, serializer):
         """Автоматическое связывание комментария с постом и автором."""
-        post = self.get_post()
-        serializer.save(author=self.request.user, post=post)
+        post = self.get_parent()
+        with transaction.atomic():
+            serializer.save(author=self.request.user, post=post)
+
+    def perform_bulk_create(self, validated_data):
+        """Вставка комментариев пачками с обновлением счётчика поста."""
+        post = self.get_parent()
+        comments = Comment.objects.bulk_create(
+            [
+                Comment(author=self.request.user, post=post, **data)
+                for data in validated_data
+            ],
+            batch_size=settings.API_BULK_BATCH_SIZE,
+        )
+        update_comments_count(post.pk, len(comments))
+        invalidate(f'comments:{post.pk}', 'posts', f'post:{post.pk}')
+        return comments
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request, *args, **kwargs):
+        """Выгрузка комментариев поста; 404, если поста нет."""
+        self.check_parent_exists()
+        return super().export(request, *args, **kwargs)
 
 
 class FollowViewSet(
+    ReadReplicaMixin,
     CreateModelMixin,
+    DestroyModelMixin,
     ListModelMixin,
     RetrieveModelMixin,
     viewsets.GenericViewSet
@@ -70,13 +243,45 @@ class FollowViewSet(
     """Управление подписками на других пользователей."""
     serializer_class = FollowSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['following__username']
+    pagination_class = FollowPagination
+    filter_backends = [PrefixSearchFilter]
+    search_fields = ['^following__username']
 
     def get_queryset(self):
-        """Получение подписок текущего пользователя."""
-        return self.request.user.follower.select_related('following')
+        """Получение подписок текущего пользователя, новые первыми."""
+        return self.request.user.follower.select_related(
+            'following'
+        ).order_by('-id')
 
     def perform_create(self, serializer):
-        """Автоматическое сохранение подписки для текущего пользователя."""
-        serializer.save(user=self.request.user)
+        """Сохранение подписки и перенос постов автора в ленту."""
+        with transaction.atomic():
+            follow = serializer.save(user=self.request.user)
+            add_author_to_feed(follow.user, follow.following)
+
+    def perform_destroy(self, instance):
+        """Отписка с удалением постов автора из ленты."""
+        with transaction.atomic():
+            remove_author_from_feed(instance.user, instance.following)
+            instance.delete()
+
+
+class FeedViewSet(
+    ReadReplicaMixin,
+    ListModelMixin,
+    viewsets.GenericViewSet
+):
+    """Лента постов авторов, на которых подписан пользователь."""
+    serializer_class = PostSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FeedPagination
+
+    def get_queryset(self):
+        """Лента текущего пользователя."""
+        return get_feed(self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        """Страница ленты; лента всегда отдаётся постранично."""
+        posts = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(posts, many=True)
+        return self.get_paginated_response(serializer.data)
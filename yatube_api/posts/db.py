@@ -0,0 +1,61 @@
+"""Настройка соединений SQLite и маршрутизация чтения на реплику."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_read_only = ContextVar('read_only', default=False)
+
+
+def is_read_only_connection(settings_dict):
+    return 'mode=ro' in str(settings_dict['NAME'])
+
+
+def apply_pragmas(cursor, pragmas, read_only=False):
+    """Выполнение PRAGMA; режим журнала меняет только пишущее соединение."""
+    for name, value in pragmas.items():
+        if read_only and name == 'journal_mode':
+            continue
+        cursor.execute(f'PRAGMA {name}={value}')
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not settings.SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(
+            cursor,
+            settings.SQLITE_PRAGMAS,
+            read_only=is_read_only_connection(connection.settings_dict)
+        )
+
+
+@contextmanager
+def read_only():
+    """Направление чтений внутри блока на соединение только для чтения."""
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+class ReadReplicaRouter:
+    """Чтение внутри read_only() идёт на реплику, запись - на default."""
+
+    def db_for_read(self, model, **hints):
+        if _read_only.get():
+            return settings.READ_REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != settings.READ_REPLICA_ALIAS
@@ -0,0 +1,195 @@
+"""Лента подписок на основе предрассчитанной таблицы FeedEntry.
+
+Новые посты раскладываются по лентам подписчиков при записи. Авторы с
+большим числом подписчиков или постов отмечаются моделью PopularAuthor:
+их посты не раскладываются и не переносятся в ленту при подписке, а
+подмешиваются в страницу ленты при чтении. Поэтому перенос при подписке
+ограничен FEED_MAX_AUTHOR_POSTS строками, а чтение ленты ничего не пишет
+в базу.
+"""
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Count, Q
+
+from .models import FeedEntry, Follow, PopularAuthor, Post
+
+
+def has_many_followers(author):
+    """Проверка, что подписчиков автора больше порога раскладки."""
+    limit = settings.FEED_FANOUT_MAX_FOLLOWERS
+    return Follow.objects.filter(following=author).values('id')[
+        limit:limit + 1
+    ].exists()
+
+
+def has_many_posts(author):
+    """Проверка, что постов автора больше порога переноса при подписке."""
+    limit = settings.FEED_MAX_AUTHOR_POSTS
+    return Post.objects.filter(author=author).values('id')[
+        limit:limit + 1
+    ].exists()
+
+
+def is_popular(author_id):
+    """Проверка, что посты автора подмешиваются в ленты при чтении.
+
+    Автор, превысивший порог, остаётся отмеченным и после отписок и
+    удаления постов: его посты, пропущенные раскладкой, иначе пропали бы
+    из лент.
+    """
+    if PopularAuthor.objects.filter(author_id=author_id).exists():
+        return True
+    if not (has_many_followers(author_id) or has_many_posts(author_id)):
+        return False
+    PopularAuthor.objects.get_or_create(author_id=author_id)
+    return True
+
+
+def fan_out_posts(author_id, posts):
+    """Добавление новых постов автора в ленты подписчиков."""
+    if not posts or is_popular(author_id):
+        return
+    followers = list(
+        Follow.objects.filter(following_id=author_id).values_list(
+            'user_id', flat=True
+        )
+    )
+    FeedEntry.objects.bulk_create(
+        [
+            FeedEntry(user_id=user_id, post=post, pub_date=post.pub_date)
+            for post in posts
+            for user_id in followers
+        ],
+        batch_size=settings.FEED_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def fan_out_post(post):
+    """Добавление нового поста в ленты подписчиков автора."""
+    fan_out_posts(post.author_id, [post])
+
+
+def add_author_to_feed(user, author):
+    """Перенос постов автора в ленту нового подписчика пачками."""
+    if is_popular(author.pk):
+        return
+    posts = Post.objects.filter(author=author).values_list(
+        'id', 'pub_date'
+    ).iterator(chunk_size=settings.FEED_BATCH_SIZE)
+    entries = (
+        FeedEntry(user=user, post_id=post_id, pub_date=pub_date)
+        for post_id, pub_date in posts
+    )
+    while batch := list(islice(entries, settings.FEED_BATCH_SIZE)):
+        FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def mark_popular_authors():
+    """Отметка всех авторов выше порогов подписчиков или постов."""
+    followed = Follow.objects.values('following').annotate(
+        total=Count('id')
+    ).filter(total__gt=settings.FEED_FANOUT_MAX_FOLLOWERS).values_list(
+        'following', flat=True
+    )
+    prolific = Post.objects.values('author').annotate(
+        total=Count('id')
+    ).filter(total__gt=settings.FEED_MAX_AUTHOR_POSTS).values_list(
+        'author', flat=True
+    )
+    PopularAuthor.objects.bulk_create(
+        [
+            PopularAuthor(author_id=author_id)
+            for author_id in {*followed, *prolific}
+        ],
+        batch_size=settings.FEED_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def backfill_feeds():
+    """Записи лент по всем подпискам на обычных авторов одним запросом.
+
+    Для наполнения базы: переносит посты так же, как add_author_to_feed
+    при каждой подписке, но INSERT ... SELECT без выгрузки строк.
+    Возвращает число добавленных записей.
+    """
+    feed = FeedEntry._meta.db_table
+    follow = Follow._meta.db_table
+    post = Post._meta.db_table
+    popular = PopularAuthor._meta.db_table
+    connection = connections[router.db_for_write(FeedEntry)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {feed} (user_id, post_id, pub_date) '
+            f'SELECT {follow}.user_id, {post}.id, {post}.pub_date '
+            f'FROM {follow} INNER JOIN {post} '
+            f'ON {post}.author_id = {follow}.following_id '
+            f'WHERE {follow}.following_id NOT IN '
+            f'(SELECT author_id FROM {popular}) '
+            f'AND NOT EXISTS (SELECT 1 FROM {feed} AS existing '
+            f'WHERE existing.user_id = {follow}.user_id '
+            f'AND existing.post_id = {post}.id)'
+        )
+        return cursor.rowcount
+
+
+def remove_author_from_feed(user, author):
+    """Удаление постов автора из ленты отписавшегося пользователя."""
+    FeedEntry.objects.filter(user=user, post__author=author).delete()
+
+
+def older_than(queryset, position, id_field):
+    """Строки, стоящие в ленте после позиции (pub_date, id поста)."""
+    if position is None:
+        return queryset
+    pub_date, post_id = position
+    return queryset.filter(
+        Q(pub_date__lt=pub_date)
+        | Q(pub_date=pub_date, **{f'{id_field}__lt': post_id})
+    )
+
+
+class Feed:
+    """Лента пользователя, начиная с самых новых постов.
+
+    Страница собирается из двух выборок по индексам: записей ленты
+    пользователя и постов популярных авторов, на которых он подписан.
+    Выборки сливаются по дате публикации, пост из обеих выводится один
+    раз.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    def get_popular_authors(self):
+        return list(
+            Follow.objects.filter(
+                user=self.user, following__popular_author__isnull=False
+            ).values_list('following_id', flat=True)
+        )
+
+    def get_page(self, limit, position=None):
+        """Не больше limit постов, стоящих в ленте после position."""
+        entries = older_than(
+            FeedEntry.objects.filter(user=self.user), position, 'post'
+        ).select_related('post__author')
+        posts = {entry.post.id: entry.post for entry in entries[:limit]}
+        authors = self.get_popular_authors()
+        if authors:
+            popular = older_than(
+                Post.objects.filter(author__in=authors), position, 'id'
+            ).select_related('author')
+            posts.update((post.id, post) for post in popular[:limit])
+        return sorted(
+            posts.values(),
+            key=lambda post: (post.pub_date, post.id),
+            reverse=True
+        )[:limit]
+
+
+def get_feed(user):
+    """Лента пользователя для постраничного чтения."""
+    return Feed(user)
@@ -0,0 +1,154 @@
+"""Обработка изображений постов: EXIF, размеры и уменьшенные копии.
+
+Обработка запускается после фиксации транзакции в пуле фоновых потоков,
+чтобы не увеличивать время ответа на создание поста. При
+POST_IMAGE_WORKERS = 0 изображение обрабатывается сразу.
+
+Файлы изображений общие для постов с одинаковым содержимым. Обработка
+и удаление постов файлы не удаляют: проверка ссылок и удаление не
+атомарны с параллельной загрузкой того же содержимого, поэтому файлы без
+ссылок удаляет команда collect_post_images с окном ожидания.
+
+Исходный файл перезаписывается, только если в нём есть EXIF: JPEG
+кодируется заново с таблицами квантования оригинала, у анимаций
+сохраняются все кадры. Результат обработки записывается, только если
+изображение поста не сменилось за время обработки.
+"""
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_save
+from PIL import Image, ImageOps, JpegImagePlugin
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+RENDITION_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.POST_IMAGE_WORKERS,
+            thread_name_prefix='post-images'
+        )
+    return _executor
+
+
+def rendition_name(image_name, size_name, extension):
+    directory, filename = posixpath.split(image_name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, 'renditions', f'{stem}_{size_name}.{extension}'
+    )
+
+
+def encode(image, image_format):
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, image_format, quality=settings.POST_IMAGE_QUALITY)
+    return buffer.getvalue()
+
+
+def strip_exif(image, image_format):
+    """Содержимое файла без EXIF и с поворотом по ориентации из EXIF."""
+    buffer = BytesIO()
+    if getattr(image, 'n_frames', 1) > 1:
+        image.save(buffer, image_format, save_all=True, exif=b'')
+        return buffer.getvalue()
+    options = {'quality': settings.POST_IMAGE_QUALITY}
+    if image_format == 'JPEG':
+        options = {'qtables': image.quantization}
+        sampling = JpegImagePlugin.get_sampling(image)
+        if sampling != -1:
+            options['subsampling'] = sampling
+    ImageOps.exif_transpose(image).save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def process_post_image(post_id):
+    """Очистка EXIF, размеры оригинала и уменьшенные копии изображения."""
+    post = Post.objects.only('id', 'image').get(pk=post_id)
+    if not post.image:
+        return
+    storage = post.image.storage
+    original_name = post.image.name
+    with post.image.open('rb') as image_file:
+        image = Image.open(BytesIO(image_file.read()))
+    image_format = image.format
+    image_name = original_name
+    if image.getexif():
+        image_name = storage.save(
+            post.image.field.generate_filename(
+                post, posixpath.basename(original_name)
+            ),
+            ContentFile(strip_exif(image, image_format))
+        )
+    image.seek(0)
+    image = ImageOps.exif_transpose(image)
+    image.load()
+
+    renditions = {}
+    for size_name, size in settings.POST_IMAGE_RENDITIONS.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)
+        renditions[size_name] = {
+            'width': resized.width,
+            'height': resized.height,
+        }
+        for extension, rendition_format in RENDITION_FORMATS.items():
+            renditions[size_name][extension] = storage.save_derived(
+                rendition_name(image_name, size_name, extension),
+                ContentFile(encode(resized, rendition_format))
+            )
+    fields = {
+        'image': image_name,
+        'image_width': image.width,
+        'image_height': image.height,
+        'image_renditions': renditions,
+    }
+    if not Post.objects.filter(pk=post_id, image=original_name).update(
+        **fields
+    ):
+        # Изображение сменилось или пост удалён: результат не нужен.
+        return
+    for field, value in fields.items():
+        setattr(post, field, value)
+    # update() не отправляет сигнал, по которому сбрасывается кеш API.
+    post_save.send(
+        sender=Post, instance=post, created=False,
+        update_fields=frozenset(fields), raw=False, using=post._state.db
+    )
+
+
+def run_in_worker(post_id):
+    close_old_connections()
+    try:
+        process_post_image(post_id)
+    except Exception:
+        logger.exception('Не удалось обработать изображение поста %s',
+                         post_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_image_processing(post):
+    """Постановка обработки изображения поста в очередь после коммита."""
+    if not post.image:
+        return
+    if settings.POST_IMAGE_WORKERS:
+        transaction.on_commit(
+            lambda: get_executor().submit(run_in_worker, post.pk)
+        )
+    else:
+        transaction.on_commit(lambda: process_post_image(post.pk))
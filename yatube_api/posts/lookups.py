@@ -0,0 +1,27 @@
+"""Дополнительные lookup-ы для строковых полей."""
+from django.db.models import CharField, Lookup
+
+MAX_CHAR = '\U0010ffff'
+
+
+@CharField.register_lookup
+class CaseFoldedPrefix(Lookup):
+    """Поиск по началу строки без учёта регистра через диапазон.
+
+    В отличие от istartswith (LIKE) условие вида
+    LOWER(поле) >= LOWER(префикс) AND LOWER(поле) < LOWER(префикс) || макс.
+    использует индекс по выражению LOWER(поле).
+    """
+    lookup_name = 'iprefix'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        sql = (
+            f'LOWER({lhs}) >= LOWER({rhs}) '
+            f'AND LOWER({lhs}) < LOWER({rhs}) || %s'
+        )
+        return sql, (
+            *lhs_params, *rhs_params, *lhs_params, *rhs_params, MAX_CHAR
+        )
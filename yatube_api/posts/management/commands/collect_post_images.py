@@ -0,0 +1,65 @@
+import posixpath
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.models import Post
+
+
+def walk(storage, path):
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield posixpath.join(path, name)
+    for directory in directories:
+        yield from walk(storage, posixpath.join(path, directory))
+
+
+class Command(BaseCommand):
+    help = 'Удаление файлов изображений, на которые не ссылается ни один пост.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int, default=3600,
+            help='Не трогать файлы моложе указанного числа секунд.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать файлы, которые будут удалены.'
+        )
+
+    def get_referenced(self):
+        referenced = set()
+        posts = Post.objects.exclude(image='').exclude(image=None).values_list(
+            'image', 'image_renditions'
+        )
+        for image, renditions in posts.iterator(chunk_size=2000):
+            referenced.add(image)
+            for rendition in renditions.values():
+                referenced.update(
+                    value for value in rendition.values()
+                    if isinstance(value, str)
+                )
+        return referenced
+
+    def handle(self, *args, **options):
+        storage = Post.image.field.storage
+        upload_to = Post.image.field.upload_to.rstrip('/')
+        if not storage.exists(upload_to):
+            return
+        threshold = timezone.now() - timedelta(seconds=options['grace'])
+        referenced = self.get_referenced()
+        removed = 0
+        for name in walk(storage, upload_to):
+            if name in referenced:
+                continue
+            if storage.get_modified_time(name) > threshold:
+                continue
+            if options['dry_run']:
+                self.stdout.write(name)
+            else:
+                storage.delete(name)
+            removed += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Неиспользуемых файлов: {removed}')
+        )
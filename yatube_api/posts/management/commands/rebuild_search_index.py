@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from posts.search import SEARCH_INDEXES, rebuild_search_indexes
+
+
+class Command(BaseCommand):
+    help = 'Перестроение полнотекстовых индексов постов и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='База данных, индексы которой нужно перестроить.'
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            self.stderr.write('Полнотекстовые индексы есть только в SQLite.')
+            return
+        rebuild_search_indexes(connection)
+        self.stdout.write(self.style.SUCCESS(
+            f'Перестроено индексов: {len(SEARCH_INDEXES)}'
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Сверка счётчиков комментариев постов с таблицей комментариев.'
+
+    def handle(self, *args, **options):
+        fixed = Post.objects.recount_comments()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}')
+        )
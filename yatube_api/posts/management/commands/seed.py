@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.seeding import DEFAULT_BATCH_SIZE, PASSWORD, Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполнение базы сгенерированными пользователями, группами, '
+        'постами, комментариями и подписками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=300000)
+        parser.add_argument(
+            '--follows', type=int, default=20,
+            help='Число подписок каждого пользователя.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Начальное значение генератора случайных чисел.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--prefix', default='user',
+            help='Начало имён создаваемых пользователей.'
+        )
+        parser.add_argument(
+            '--keep-indexes', action='store_true',
+            help='Не удалять вторичные индексы на время вставки.'
+        )
+
+    def log(self, model, rows, seconds):
+        self.stdout.write(
+            f'{model:>10}: {rows:10d} строк за {seconds:8.2f} с, '
+            f'{rows / max(seconds, 1e-9):10.0f} строк/с'
+        )
+
+    def handle(self, *args, **options):
+        seeder = Seeder(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            prefix=options['prefix'],
+            log=self.log,
+        )
+        started = time.perf_counter()
+        stats = seeder.seed(
+            users=options['users'],
+            groups=options['groups'],
+            posts=options['posts'],
+            comments=options['comments'],
+            follows_per_user=options['follows'],
+            drop_indexes=not options['keep_indexes'],
+        )
+        elapsed = time.perf_counter() - started
+        for name, seconds in seeder.timings.items():
+            self.stdout.write(f'{name:>10}: {seconds:8.2f} с')
+        rows = sum(created for created, _ in stats.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано строк: {rows} за {elapsed:.2f} с, '
+            f'{rows / max(elapsed, 1e-9):.0f} строк/с. '
+            f'Пароль пользователей: {PASSWORD}'
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:47
+
+from django.db import migrations, models
+import posts.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, db_index=True, null=True, storage=posts.storage.get_post_image_storage, upload_to='posts/', verbose_name='Изображение'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from posts.search import drop_search_indexes, install_search_indexes
+
+
+def create_search_indexes(apps, schema_editor):
+    install_search_indexes(schema_editor.connection)
+
+
+def remove_search_indexes(apps, schema_editor):
+    drop_search_indexes(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_image_content_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, remove_search_indexes),
+    ]
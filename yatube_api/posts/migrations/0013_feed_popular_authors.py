@@ -0,0 +1,46 @@
+# Generated by Django 4.2.10 on 2026-10-18 06:32
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+def mark_popular_authors(apps, schema_editor):
+    """Авторы, посты которых раскладка уже пропускала."""
+    Follow = apps.get_model('posts', 'Follow')
+    PopularAuthor = apps.get_model('posts', 'PopularAuthor')
+    authors = Follow.objects.values('following').annotate(
+        followers=Count('id')
+    ).filter(followers__gt=settings.FEED_FANOUT_MAX_FOLLOWERS)
+    PopularAuthor.objects.bulk_create([
+        PopularAuthor(author_id=row['following']) for row in authors
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('posts', '0012_post_group_pub_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularAuthor',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='popular_author', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+            ],
+            options={
+                'verbose_name': 'Популярный автор',
+                'verbose_name_plural': 'Популярные авторы',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-pub_date', '-id'], name='post_author_pub_date_idx'),
+        ),
+        migrations.RunPython(
+            mark_popular_authors, migrations.RunPython.noop
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .storage import get_post_image_storage
 
 User = get_user_model()
 
@@ -18,6 +22,34 @@ class Group(models.Model):
         verbose_name_plural = 'Группы'
 
 
+class PostQuerySet(models.QuerySet):
+    """Набор запросов к постам с подготовкой выборки для API."""
+
+    API_FIELDS = (
+        'id', 'text', 'pub_date', 'image', 'image_width', 'image_height',
+        'image_renditions', 'group', 'comments_count', 'author__username',
+    )
+
+    def for_api(self):
+        """Посты с автором в одном запросе и без лишних колонок."""
+        return self.select_related('author').only(*self.API_FIELDS)
+
+    def recount_comments(self):
+        """Исправление счётчиков комментариев, разошедшихся с таблицей."""
+        actual = Coalesce(
+            Subquery(
+                Comment.objects.filter(post=OuterRef('pk'))
+                .values('post')
+                .annotate(total=Count('id'))
+                .values('total')
+            ),
+            0
+        )
+        return self.alias(actual=actual).exclude(
+            comments_count=F('actual')
+        ).update(comments_count=F('actual'))
+
+
 class Post(models.Model):
     """Модель поста с текстом, изображением и привязкой к группе."""
     text = models.TextField(verbose_name='Текст')
@@ -42,16 +74,57 @@ class Post(models.Model):
     )
     image = models.ImageField(
         upload_to='posts/',
+        storage=get_post_image_storage,
         null=True,
         blank=True,
+        db_index=True,
         verbose_name='Изображение'
     )
+    image_width = models.PositiveIntegerField(
+        'Ширина изображения',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    image_height = models.PositiveIntegerField(
+        'Высота изображения',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    image_renditions = models.JSONField(
+        'Копии изображения',
+        default=dict,
+        blank=True,
+        editable=False
+    )
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     def __str__(self):
         return self.text[:50]
 
     class Meta:
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_pub_date_id_idx',
+            ),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_pub_date_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_pub_date_idx',
+            ),
+        ]
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
@@ -78,10 +151,16 @@ class Comment(models.Model):
     )
 
     def __str__(self):
-        return f'Комментарий {self.author} к посту {self.post.id}'
+        return f'Комментарий {self.author} к посту {self.post_id}'
 
     class Meta:
-        ordering = ('-created',)
+        ordering = ('-created', '-id')
+        indexes = [
+            models.Index(
+                fields=['post', '-created', '-id'],
+                name='comment_post_created_id_idx',
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
@@ -117,3 +196,58 @@ class Follow(models.Model):
         ]
         verbose_name = 'Подписка'
         verbose_name_plural = 'Подписки'
+
+
+class FeedEntry(models.Model):
+    """Запись предрассчитанной ленты подписок пользователя."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Читатель'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Пост'
+    )
+    pub_date = models.DateTimeField('Дата публикации')
+
+    def __str__(self):
+        return f'Пост {self.post_id} в ленте {self.user_id}'
+
+    class Meta:
+        ordering = ('-pub_date', '-post')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'],
+                name='unique_feed_entry',
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date', '-post'],
+                name='feed_user_pub_date_idx',
+            ),
+        ]
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи ленты'
+
+
+class PopularAuthor(models.Model):
+    """Автор, посты которого не раскладываются по лентам при записи."""
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='popular_author',
+        verbose_name='Автор'
+    )
+
+    def __str__(self):
+        return str(self.author_id)
+
+    class Meta:
+        verbose_name = 'Популярный автор'
+        verbose_name_plural = 'Популярные авторы'
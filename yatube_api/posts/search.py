@@ -0,0 +1,139 @@
+"""Полнотекстовый поиск по постам и комментариям на SQLite FTS5.
+
+Для каждой модели создаётся FTS5-таблица с внешним содержимым: сами
+тексты хранятся только в таблице модели, а индекс синхронизируют
+триггеры базы данных, поэтому он обновляется при любом изменении, в том
+числе при bulk_create, update и каскадном удалении.
+"""
+import re
+
+from django.db import connections
+
+SEARCH_INDEXES = {
+    'posts_post': 'text',
+    'posts_comment': 'text',
+}
+TOKENIZER = 'unicode61 remove_diacritics 2'
+MAX_TERMS = 10
+
+
+def index_table(db_table):
+    return f'{db_table}_fts'
+
+
+def index_triggers(db_table, column):
+    fts = index_table(db_table)
+    insert = (
+        f'INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column});'
+    )
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {column}) "
+        f"VALUES ('delete', old.id, old.{column});"
+    )
+    return {
+        f'{fts}_insert': f'AFTER INSERT ON {db_table} BEGIN {insert} END',
+        f'{fts}_delete': f'AFTER DELETE ON {db_table} BEGIN {delete} END',
+        f'{fts}_update': (
+            f'AFTER UPDATE OF {column} ON {db_table} '
+            f'BEGIN {delete} {insert} END'
+        ),
+    }
+
+
+def existing_objects(cursor, object_type):
+    cursor.execute(
+        'SELECT name FROM sqlite_master WHERE type = %s', [object_type]
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def install_search_indexes(connection):
+    """Создание индексов и триггеров, которых нет, с переиндексацией."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        tables = existing_objects(cursor, 'table')
+        triggers = existing_objects(cursor, 'trigger')
+        for db_table, column in SEARCH_INDEXES.items():
+            fts = index_table(db_table)
+            missing = {
+                name: definition
+                for name, definition in index_triggers(
+                    db_table, column
+                ).items()
+                if name not in triggers
+            }
+            if fts in tables and not missing:
+                continue
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5('
+                f"{column}, content='{db_table}', content_rowid='id', "
+                f"tokenize='{TOKENIZER}')"
+            )
+            for name, definition in missing.items():
+                cursor.execute(f'CREATE TRIGGER {name} {definition}')
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_search_indexes(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for db_table, column in SEARCH_INDEXES.items():
+            for name in index_triggers(db_table, column):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'DROP TABLE IF EXISTS {index_table(db_table)}')
+
+
+def rebuild_search_indexes(connection):
+    """Полная переиндексация и слияние сегментов индексов."""
+    install_search_indexes(connection)
+    with connection.cursor() as cursor:
+        for db_table in SEARCH_INDEXES:
+            fts = index_table(db_table)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+
+
+def restore_search_triggers(sender, using, **kwargs):
+    """Возврат триггеров после миграций, пересоздающих таблицу модели.
+
+    SQLite удаляет триггеры вместе с таблицей, поэтому после изменения
+    поля модели индекс перестал бы обновляться.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    tables = connection.introspection.table_names()
+    if all(index_table(db_table) in tables for db_table in SEARCH_INDEXES):
+        install_search_indexes(connection)
+
+
+def has_search_index(queryset):
+    return (
+        queryset.model._meta.db_table in SEARCH_INDEXES
+        and connections[queryset.db].vendor == 'sqlite'
+    )
+
+
+def get_search_terms(query):
+    return re.findall(r'\w+', query)[:MAX_TERMS]
+
+
+def search(queryset, query):
+    """Записи, содержащие все слова запроса, по убыванию релевантности.
+
+    Каждое слово ищется как префикс, чтобы находить словоформы.
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset
+    db_table = queryset.model._meta.db_table
+    fts = index_table(db_table)
+    return queryset.extra(
+        tables=[fts],
+        where=[f'{fts}.rowid = {db_table}.id', f'{fts} MATCH %s'],
+        params=[' '.join(f'"{term}"*' for term in terms)],
+        select={'search_rank': f'bm25({fts})'},
+        order_by=['search_rank', '-id'],
+    )
@@ -0,0 +1,292 @@
+"""Генерация больших объёмов тестовых данных.
+
+Пользователи, группы, посты, комментарии и подписки создаются пачками
+через bulk_create, каждая модель - в одной транзакции. Содержимое
+определяется начальным значением генератора случайных чисел: при одном
+seed на пустой базе получаются одинаковые данные.
+
+Комментарии распределены неравномерно: у небольшой доли постов их
+намного больше, чем у остальных, как у популярных постов. После подписок
+авторы выше порогов posts.feed отмечаются популярными, а ленты остальных
+подписок заполняются, как при подписке через API.
+
+На SQLite вторичные индексы и полнотекстовый индекс можно удалить на
+время вставки и построить заново после неё: одно построение индекса по
+готовой таблице быстрее, чем обновление его на каждую строку.
+Уникальные индексы остаются, на них опирается ignore_conflicts.
+"""
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .feed import backfill_feeds, mark_popular_authors
+from .models import Comment, FeedEntry, Follow, Group, Post
+from .search import drop_search_indexes, install_search_indexes
+
+User = get_user_model()
+
+WORDS = (
+    'город', 'река', 'утро', 'вечер', 'книга', 'дорога', 'музыка', 'кофе',
+    'поезд', 'море', 'лес', 'снег', 'солнце', 'друг', 'работа', 'проект',
+    'идея', 'фото', 'прогулка', 'выходные', 'новости', 'история', 'кино',
+    'осень', 'весна', 'лето', 'зима', 'код', 'сервер', 'запрос', 'ответ',
+    'python', 'django', 'api', 'тест', 'релиз', 'ошибка', 'исправление',
+)
+PASSWORD = 'seed-password'
+DEFAULT_BATCH_SIZE = 5000
+# Чем больше показатель, тем сильнее комментарии сосредоточены на
+# небольшой доле постов.
+COMMENT_SKEW = 3
+POST_INTERVAL = timedelta(minutes=1)
+SEEDED_MODELS = (User, Group, Post, Comment, Follow, FeedEntry)
+
+
+def make_text(rng, min_words, max_words):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return ' '.join(words).capitalize() + '.'
+
+
+def batched(objects, size):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def get_ids(model):
+    return list(model.objects.order_by('id').values_list('id', flat=True))
+
+
+@contextmanager
+def explicit_dates(model, *field_names):
+    """Отключение auto_now_add, чтобы bulk_create сохранил заданные даты."""
+    fields = {
+        field: field.auto_now_add
+        for field in map(model._meta.get_field, field_names)
+    }
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now_add in fields.items():
+            field.auto_now_add = auto_now_add
+
+
+def get_secondary_indexes(connection, tables):
+    """Имена и определения неуникальных индексов таблиц в SQLite."""
+    placeholders = ', '.join(['%s'] * len(tables))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            f'AND tbl_name IN ({placeholders}) AND sql IS NOT NULL '
+            "AND sql NOT LIKE 'CREATE UNIQUE%%'",
+            list(tables)
+        )
+        return cursor.fetchall()
+
+
+@contextmanager
+def without_secondary_indexes(connection, tables):
+    """Удаление вторичных индексов на время блока и построение заново.
+
+    Индексы строятся и при ошибке внутри блока, после построения
+    обновляется статистика планировщика.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    indexes = get_secondary_indexes(connection, tables)
+    drop_search_indexes(connection)
+    with connection.cursor() as cursor:
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, sql in indexes:
+                cursor.execute(sql)
+        install_search_indexes(connection)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+
+class Seeder:
+    """Наполнение базы данными заданного объёма.
+
+    stats после работы содержит для каждой модели число созданных строк
+    и время в секундах, timings - время построения индексов и пересчёта
+    счётчиков комментариев.
+    """
+
+    def __init__(self, seed=0, batch_size=DEFAULT_BATCH_SIZE,
+                 prefix='user', log=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.log = log
+        self.stats = {}
+        self.timings = {}
+        self.now = timezone.now().replace(microsecond=0)
+
+    def create(self, model, objects):
+        """Создание объектов пачками в одной транзакции."""
+        started = time.perf_counter()
+        rows = 0
+        with transaction.atomic():
+            for batch in batched(objects, self.batch_size):
+                model.objects.bulk_create(batch, ignore_conflicts=True)
+                rows += len(batch)
+        elapsed = time.perf_counter() - started
+        name = model._meta.model_name
+        created, seconds = self.stats.get(name, (0, 0.0))
+        self.stats[name] = (created + rows, seconds + elapsed)
+        if self.log is not None:
+            self.log(name, rows, elapsed)
+        return rows
+
+    def seed_users(self, count):
+        password = make_password(PASSWORD)
+        offset = User.objects.count()
+        self.create(User, (
+            User(
+                username=f'{self.prefix}{offset + index}',
+                password=password,
+            )
+            for index in range(count)
+        ))
+
+    def seed_groups(self, count):
+        offset = Group.objects.count()
+        self.create(Group, (
+            Group(
+                title=f'Группа {offset + index}',
+                slug=f'group-{offset + index}',
+                description=make_text(self.rng, 5, 20),
+            )
+            for index in range(count)
+        ))
+
+    def seed_posts(self, count, group_share=0.5):
+        """Посты случайных авторов с датами через POST_INTERVAL."""
+        author_ids = get_ids(User)
+        if not count or not author_ids:
+            return
+        group_ids = get_ids(Group)
+        rng = self.rng
+        start = self.now - POST_INTERVAL * count
+
+        def posts():
+            for index in range(count):
+                group_id = None
+                if group_ids and rng.random() < group_share:
+                    group_id = rng.choice(group_ids)
+                yield Post(
+                    text=make_text(rng, 5, 60),
+                    author_id=rng.choice(author_ids),
+                    group_id=group_id,
+                    pub_date=start + POST_INTERVAL * index,
+                )
+
+        with explicit_dates(Post, 'pub_date'):
+            self.create(Post, posts())
+
+    def seed_comments(self, count):
+        """Комментарии со смещением к небольшой доле постов."""
+        author_ids = get_ids(User)
+        posts = list(
+            Post.objects.order_by('-id').values_list('id', 'pub_date')
+        )
+        if not count or not posts or not author_ids:
+            return
+        rng = self.rng
+
+        def comments():
+            for _ in range(count):
+                post_id, pub_date = posts[
+                    int(len(posts) * rng.random() ** COMMENT_SKEW)
+                ]
+                yield Comment(
+                    text=make_text(rng, 2, 30),
+                    author_id=rng.choice(author_ids),
+                    post_id=post_id,
+                    created=pub_date + timedelta(
+                        seconds=rng.randint(1, 24 * 60 * 60)
+                    ),
+                )
+
+        with explicit_dates(Comment, 'created'):
+            self.create(Comment, comments())
+
+    def recount_comments(self):
+        """Счётчики комментариев постов одним запросом."""
+        started = time.perf_counter()
+        with transaction.atomic():
+            Post.objects.recount_comments()
+        self.timings['recount'] = time.perf_counter() - started
+
+    def seed_follows(self, per_user):
+        """Подписки каждого пользователя на per_user других."""
+        user_ids = get_ids(User)
+        per_user = min(per_user, len(user_ids) - 1)
+        rng = self.rng
+
+        def follows():
+            for user_id in user_ids:
+                following = set()
+                while len(following) < per_user:
+                    following_id = rng.choice(user_ids)
+                    if following_id != user_id:
+                        following.add(following_id)
+                for following_id in sorted(following):
+                    yield Follow(user_id=user_id, following_id=following_id)
+
+        if per_user > 0:
+            self.create(Follow, follows())
+
+    def seed_feeds(self):
+        """Популярные авторы и записи лент по всем подпискам."""
+        started = time.perf_counter()
+        with transaction.atomic():
+            mark_popular_authors()
+            rows = backfill_feeds()
+        elapsed = time.perf_counter() - started
+        name = FeedEntry._meta.model_name
+        created, seconds = self.stats.get(name, (0, 0.0))
+        self.stats[name] = (created + rows, seconds + elapsed)
+        if self.log is not None:
+            self.log(name, rows, elapsed)
+
+    def seed(self, users=0, groups=0, posts=0, comments=0,
+             follows_per_user=0, drop_indexes=False):
+        """Наполнение всех моделей; счётчики пересчитываются с индексами."""
+        if drop_indexes:
+            connection = connections[router.db_for_write(Post)]
+            indexes = without_secondary_indexes(connection, [
+                model._meta.db_table for model in SEEDED_MODELS
+            ])
+        else:
+            indexes = nullcontext()
+        with indexes:
+            self.seed_users(users)
+            self.seed_groups(groups)
+            self.seed_posts(posts)
+            self.seed_comments(comments)
+            self.seed_follows(follows_per_user)
+            self.seed_feeds()
+            started = time.perf_counter()
+        if drop_indexes:
+            self.timings['indexes'] = time.perf_counter() - started
+        self.recount_comments()
+        return self.stats
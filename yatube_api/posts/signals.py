@@ -0,0 +1,26 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Comment, Post
+
+
+def update_comments_count(post_id, delta):
+    Post.objects.filter(pk=post_id).update(
+        comments_count=F('comments_count') + delta
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    """Увеличение счётчика комментариев поста."""
+    if created and not raw:
+        update_comments_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    """Уменьшение счётчика, если пост не удаляется вместе с комментарием."""
+    if isinstance(origin, Post) or getattr(origin, 'model', None) is Post:
+        return
+    update_comments_count(instance.post_id, -1)
@@ -0,0 +1,54 @@
+"""Хранилище изображений постов с адресацией по содержимому.
+
+Имя файла - SHA-256 его содержимого, поэтому одинаковые загрузки
+хранятся одним файлом, а содержимое файла под любым именем никогда не
+меняется и может кешироваться клиентами бессрочно.
+
+Повторное сохранение существующего файла обновляет время его изменения:
+collect_post_images не трогает файлы моложе окна ожидания, и файл, на
+который вот-вот сошлётся новый пост, не будет удалён.
+"""
+import hashlib
+import os
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Файловое хранилище, именующее файлы по хешу содержимого."""
+
+    def get_content_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(
+            posixpath.dirname(name), digest[:2], digest + extension
+        )
+
+    def save(self, name, content, max_length=None):
+        """Сохранение под именем-хешем; повторная загрузка не пишет файл."""
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.get_content_name(name, content)
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length)
+
+    def save_derived(self, name, content):
+        """Сохранение производного файла под заранее известным именем."""
+        if self.exists(name):
+            return name
+        return super().save(name, content)
+
+
+post_image_storage = ContentAddressedStorage()
+
+
+def get_post_image_storage():
+    return post_image_storage
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -26,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.querylog.QueryInspectionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,10 +64,95 @@ WSGI_APPLICATION = 'yatube_api.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('YATUBE_DB_NAME', BASE_DIR / 'db.sqlite3'),
     }
 }
 
+# Профиль БД: development - SQLite по умолчанию, production - WAL,
+# постоянные соединения и чтение безопасных запросов через реплику.
+DB_PROFILE = os.getenv('YATUBE_DB_PROFILE', 'development')
+
+READ_REPLICA_ALIAS = 'replica'
+
+# База данных корзин токенов для ограничения частоты запросов.
+API_THROTTLE_DATABASE = 'default'
+
+SQLITE_PRAGMAS = {}
+
+DATABASE_ROUTERS = []
+
+if DB_PROFILE == 'production':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    })
+    DATABASES[READ_REPLICA_ALIAS] = {
+        **DATABASES['default'],
+        'NAME': f'file:{DATABASES["default"]["NAME"]}?mode=ro',
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASES['throttle'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv(
+            'YATUBE_THROTTLE_DB_NAME', BASE_DIR / 'throttle.sqlite3'
+        ),
+    }
+    API_THROTTLE_DATABASE = 'throttle'
+    DATABASE_ROUTERS = [
+        'api.throttling.ThrottleRouter',
+        'posts.db.ReadReplicaRouter',
+    ]
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'busy_timeout': 5000,
+        'temp_store': 'MEMORY',
+    }
+
+# Кеш ответов API: LRU в памяти процесса по умолчанию, файловый кеш,
+# общий для всех процессов, если задан каталог API_CACHE_DIR. ETag
+# отдаются только с общим кешем.
+API_CACHE_ALIAS = 'api'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    API_CACHE_ALIAS: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api-responses',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+# Записи пользователей для JWT-аутентификации должны быть общими для
+# всех процессов, иначе деактивация видна только в одном из них. Файловый
+# кеш общий для процессов одного сервера; при нескольких серверах нужен
+# общий бэкенд (Redis, Memcached). Каталог принадлежит проекту: в общем
+# временном каталоге записи могли бы подменить другие пользователи
+# сервера или стереть другие копии проекта.
+JWT_USER_CACHE_ALIAS = 'jwt-users'
+CACHES[JWT_USER_CACHE_ALIAS] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': os.getenv(
+        'JWT_USER_CACHE_DIR', BASE_DIR / '.cache' / 'jwt-users'
+    ),
+    'OPTIONS': {'MAX_ENTRIES': 100000},
+}
+
+if os.getenv('API_CACHE_DIR'):
+    CACHES[API_CACHE_ALIAS].update({
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('API_CACHE_DIR'),
+    })
+
+# Группы меняются редко, а правки сбрасывают кеш сигналами, поэтому
+# ответы с группами хранятся дольше остальных.
+GROUP_CACHE_TIMEOUT = 24 * 60 * 60
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -93,6 +181,9 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -100,8 +191,24 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    ]
+        'api.authentication.StatelessJWTAuthentication',
+    ],
+
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.TokenBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '300/min',
+        'user': '600/min',
+        'posts-write': '30/min',
+        'comments-write': '60/min',
+        'auth': '20/min',
+    },
 }
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -110,3 +217,42 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+
+JWT_USER_CACHE_TTL = 300
+
+FEED_FANOUT_MAX_FOLLOWERS = 1000
+FEED_MAX_AUTHOR_POSTS = 1000
+FEED_BATCH_SIZE = 500
+
+API_BULK_MAX_ITEMS = 1000
+API_BULK_BATCH_SIZE = 500
+API_COMPACT_TEXT_LENGTH = 280
+# Списки постов, комментариев и групп собираются из .values() в обход
+# полей DRF; формат ответа не меняется.
+API_FAST_SERIALIZATION = False
+API_EXPORT_CHUNK_SIZE = 2000
+API_THROTTLE_BUCKET_TTL = 24 * 60 * 60
+# Заголовок Server-Timing с временем SQL и сериализации в ответах.
+API_SERVER_TIMING = DEBUG
+# Доступ к /metrics для Prometheus: с токеном только по заголовку
+# "Authorization: Bearer <токен>", без токена - с адресов
+# METRICS_ALLOWED_IPS и без заголовков обратного прокси.
+METRICS_TOKEN = os.getenv('YATUBE_METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = ('127.0.0.1', '::1')
+# Журнал медленных и повторных SQL-запросов для разработки и staging;
+# в строгом режиме повтор запроса - ошибка.
+API_QUERY_INSPECTION = os.getenv('YATUBE_QUERY_INSPECTION', str(DEBUG)) in (
+    'True', '1'
+)
+API_QUERY_INSPECTION_STRICT = os.getenv('YATUBE_QUERY_STRICT') == '1'
+API_SLOW_QUERY_MS = 100
+
+POST_IMAGE_WORKERS = 2
+POST_IMAGE_MAX_BYTES = 10 * 1024 * 1024
+POST_IMAGE_MAX_DIMENSION = 8000
+POST_IMAGE_QUALITY = 85
+POST_IMAGE_RENDITIONS = {
+    'thumb': 160,
+    'small': 480,
+    'medium': 1080,
+}